@@ -0,0 +1,187 @@
+"""Benchmark des temps de frame de BusinessClicker, sans écran ni carte son.
+
+Lance le jeu avec les drivers SDL "dummy", joue des scénarios scriptés et mesure
+pour chaque phase les percentiles p50 / p95 / p99 (en ms) de la frame complète et
+de chaque étape : update, draw_upgrade_panel, draw_stats, draw_particles,
+draw_messages (et draw_pause_menu pour le menu pause).
+
+    python benchmarks/bench_frames.py --frames 300 --output bench.json
+    python benchmarks/bench_frames.py --compare bench.json   # compare au run précédent
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import pygame
+from game import BusinessClicker
+from models import Upgrade
+
+STAGES = ['update', 'draw_upgrade_panel', 'draw_stats', 'draw_particles', 'draw_messages']
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    cuts = statistics.quantiles(samples, n=100, method='inclusive') if len(samples) > 1 else samples * 99
+    return {
+        'p50': cuts[49],
+        'p95': cuts[94],
+        'p99': cuts[98],
+        'mean': statistics.fmean(samples),
+    }
+
+
+def timed(function):
+    start = time.perf_counter_ns()
+    function()
+    return (time.perf_counter_ns() - start) / 1e6
+
+
+def run_phase(game, frames, before_frame=None, stages=STAGES):
+    timings = {stage: [] for stage in ['frame'] + stages}
+    for _ in range(frames):
+        if before_frame:
+            before_frame(game)
+        start = time.perf_counter_ns()
+        if not game.paused:
+            game.update()
+        game.draw()
+        timings['frame'].append((time.perf_counter_ns() - start) / 1e6)
+
+        # Chaque étape est aussi mesurée seule, qu'elle soit sale ou non pour le renderer
+        for stage in stages:
+            timings[stage].append(timed(getattr(game, stage)))
+    return {stage: percentiles(samples) for stage, samples in timings.items()}
+
+
+def scenario_idle(game, frames):
+    return run_phase(game, frames)
+
+
+def scenario_click_storm(game, frames):
+    def click(game):
+        for _ in range(20):
+            game.handle_click(game.document_rect.center)
+    return run_phase(game, frames, click)
+
+
+def scenario_particles(game, frames):
+    def top_up(game):
+        missing = 1000 - len(game.particles)
+        if missing > 0:
+            game.create_particles(game.document_rect.center, missing)
+    return run_phase(game, frames, top_up)
+
+
+def scenario_long_story_message(game, frames):
+    longest = max(game.sim.story_events, key=lambda event: len(event.description))
+
+    def keep_message(game):
+        if not game.notifications:
+            game.add_message(longest.title, longest.description, priority='story')
+    return run_phase(game, frames, keep_message)
+
+
+def scenario_paused_menu(game, frames):
+    game.paused = True
+    return run_phase(game, frames, stages=STAGES + ['draw_pause_menu'])
+
+
+def scenario_large_upgrade_list(game, frames):
+    for i in range(200):
+        upgrade = Upgrade(f"Amélioration {i}", 10 * (i + 1), 0.1 * (i + 1), "Générée pour le benchmark")
+        game.sim.upgrades.append(upgrade)
+        game.upgrade_icons[upgrade.name] = pygame.Surface((32, 32)).convert()
+    game.setup_ui()
+    game.setup_renderer()
+    return run_phase(game, frames)
+
+
+SCENARIOS = {
+    'idle': scenario_idle,
+    'click_storm': scenario_click_storm,
+    'particles_1000': scenario_particles,
+    'long_story_message': scenario_long_story_message,
+    'paused_menu': scenario_paused_menu,
+    'large_upgrade_list': scenario_large_upgrade_list,
+}
+
+
+def new_game():
+    # Chaque scénario part d'une partie neuve, dans un dossier temporaire :
+    # pas de sauvegarde existante relue, et aucune écriture dans celle du joueur
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    for name in ('assets', 'content'):
+        os.symlink(os.path.join(ROOT, name), os.path.join(workdir, name))
+    os.chdir(workdir)
+    return BusinessClicker(), workdir
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous):
+    print(f"\nComparaison avec {previous.get('commit') or 'le run précédent'} (p95, ms)")
+    for name, stages in results['scenarios'].items():
+        old_stages = previous.get('scenarios', {}).get(name, {})
+        for stage, values in stages.items():
+            if stage in old_stages:
+                old, new = old_stages[stage]['p95'], values['p95']
+                change = (new - old) / old * 100 if old else 0.0
+                print(f"  {name:<20} {stage:<20} {old:8.3f} -> {new:8.3f}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=300, help="frames mesurées par scénario")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="scénario à lancer (tous par défaut)")
+    parser.add_argument('--output', help="fichier JSON où écrire les résultats")
+    parser.add_argument('--compare', help="résultats JSON d'un run précédent à comparer")
+    args = parser.parse_args()
+    # Les scénarios changent de dossier courant : chemins résolus avant
+    output = os.path.abspath(args.output) if args.output else None
+    previous = os.path.abspath(args.compare) if args.compare else None
+
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'frames': args.frames,
+        'scenarios': {},
+    }
+    for name in args.scenario or SCENARIOS:
+        game, workdir = new_game()
+        results['scenarios'][name] = SCENARIOS[name](game, args.frames)
+        game.autosave.stop()
+        os.chdir(ROOT)
+        shutil.rmtree(workdir)
+        frame = results['scenarios'][name]['frame']
+        print(f"{name:<20} frame p50 {frame['p50']:7.3f} ms  p95 {frame['p95']:7.3f} ms  p99 {frame['p99']:7.3f} ms")
+    pygame.quit()
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if previous:
+        with open(previous) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,34 +8,3 @@ class Achievement:
     condition_value: int
     reward: float
     unlocked: bool = False
-
-ACHIEVEMENTS = [
-    Achievement(
-        "Débutant",
-        "Cliquez 10 fois",
-        "clicks",
-        10,
-        50.0
-    ),
-    Achievement(
-        "Travailleur Acharné",
-        "Cliquez 1000 fois",
-        "clicks",
-        1000,
-        100.0
-    ),
-    Achievement(
-        "Entrepreneur",
-        "Achetez 10 améliorations",
-        "upgrades",
-        10,
-        200.0
-    ),
-    Achievement(
-        "Millionnaire",
-        "Gagnez 1 000 000€",
-        "money_earned",
-        1000000,
-        1000.0
-    )
-]
\ No newline at end of file
@@ -0,0 +1,103 @@
+import heapq
+import math
+from pricing import locate
+
+
+def payback_at(cost, rate):
+    return cost / rate if rate > 0 else math.inf
+
+
+def payback(upgrade, effects):
+    """Secondes de revenu passif pour rembourser le prochain niveau (effets compris)."""
+    return payback_at(upgrade.cost, effects.level_rate(upgrade))
+
+
+class Advisor:
+    """Meilleur prochain achat, d'après le temps de retour (coût / gain par seconde).
+
+    Les améliorations sont dans un tas trié par temps de retour. Une entrée garde
+    le coût qu'elle a vu : après un achat le coût monte, l'entrée devient périmée
+    et remonte en tête ; elle est alors simplement remplacée (invalidation
+    paresseuse). Une requête coûte donc O(1), plus O(log n) par achat depuis la
+    précédente. Le tas est reconstruit quand les effets (bonus, buffs) changent.
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.rebuild()
+
+    def rebuild(self):
+        """À appeler quand les coûts peuvent baisser (chargement d'une sauvegarde)."""
+        self.upgrades = self.sim.upgrades
+        self.effects_version = self.sim.effects.version
+        self.heap = [(payback(upgrade, self.sim.effects), i, upgrade.cost) for i, upgrade in enumerate(self.upgrades)]
+        heapq.heapify(self.heap)
+
+    def best(self):
+        if self.sim.upgrades is not self.upgrades or self.sim.effects.version != self.effects_version:
+            self.rebuild()  # Contenu rechargé ou gains par niveau modifiés
+        heap = self.heap
+        while heap:
+            _, i, cost = heap[0]
+            upgrade = self.upgrades[i]
+            if upgrade.cost == cost:
+                return upgrade
+            heapq.heapreplace(heap, (payback(upgrade, self.sim.effects), i, upgrade.cost))
+        return None
+
+    def plan(self, target, click_rate=0.0, max_steps=100):
+        """Achats qui amènent l'argent possédé à `target`, et en combien de temps.
+
+        C'est une approximation, pas forcément la suite d'achats la plus rapide.
+        Glouton : parmi les achats qui rapprochent la cible (attendre de pouvoir
+        payer, acheter, puis attendre la cible avec le nouveau revenu bat le fait
+        d'attendre sans rien acheter), on prend celui qui a le plus petit temps
+        d'attente + temps de retour, et on recommence. `click_rate` en clics par
+        seconde s'ajoute au revenu passif. Renvoie (durée en secondes,
+        [(seconde de l'achat, amélioration), ...]).
+        """
+        sim = self.sim
+        money = sim.money
+        income = sim.passive_income + click_rate * sim.click_income
+        rates = {id(upgrade): sim.effects.level_rate(upgrade) for upgrade in sim.upgrades}
+        levels = {id(upgrade): locate(upgrade, sim.cost_growth) for upgrade in sim.upgrades}
+        elapsed = 0.0
+        purchases = []
+
+        def wait(amount, income):
+            if amount <= 0:
+                return 0.0
+            return amount / income if income > 0 else math.inf
+
+        for _ in range(max_steps):
+            without = wait(target - money, income)
+            best_score, best_choice = math.inf, None
+            for upgrade in sim.upgrades:
+                table, index = levels[id(upgrade)]
+                cost = table.cost_at(index)
+                delay = wait(cost - money, income)
+                after = money + income * delay - cost
+                if delay + wait(target - after, income + rates[id(upgrade)]) < without:
+                    score = delay + payback_at(cost, rates[id(upgrade)])
+                    if score < best_score:
+                        best_score, best_choice = score, (upgrade, delay, cost)
+            if best_choice is None:
+                return elapsed + without, purchases
+
+            upgrade, delay, cost = best_choice
+            elapsed += delay
+            money += income * delay - cost
+            income += rates[id(upgrade)]
+            table, index = levels[id(upgrade)]
+            levels[id(upgrade)] = (table, index + 1)
+            purchases.append((elapsed, upgrade))
+        return elapsed + wait(target - money, income), purchases
+
+    def next_promotion(self):
+        """(poste, seuil) suivant le poste actuel, ou None au sommet."""
+        current = self.sim.promotion_levels.get(self.sim.current_position, 0)
+        higher = [(threshold, position) for position, threshold in self.sim.promotion_levels.items() if threshold > current]
+        if not higher:
+            return None
+        threshold, position = min(higher)
+        return position, threshold
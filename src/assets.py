@@ -0,0 +1,71 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import pygame
+from pygame import mixer
+from autosave import write_atomic
+from constants import ASSET_CACHE_DIR, ASSET_WORKERS
+
+
+class AssetLoader:
+    """Charge images et sons en parallèle sur un pool de threads.
+
+    Le décodage (et la mise à l'échelle) se fait hors du thread principal ; les
+    images déjà mises à l'échelle sont gardées sur disque, indexées par le hash du
+    fichier source et la taille demandée, pour que les lancements suivants n'aient
+    plus qu'à relire des pixels bruts. La conversion au format de l'écran
+    (`convert` / `convert_alpha`) reste sur le thread principal.
+    """
+
+    def __init__(self, cache_dir=ASSET_CACHE_DIR, workers=ASSET_WORKERS):
+        self.cache_dir = cache_dir
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.futures = {}
+
+    def image(self, name, path, size=None, optional=False):
+        self.futures[name] = self.executor.submit(self.decode_image, path, size, optional)
+
+    def sound(self, name, path):
+        self.futures[name] = self.executor.submit(mixer.Sound, path)
+
+    def cache_path(self, path, size):
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}-{size[0]}x{size[1]}.rgba")
+
+    def decode_image(self, path, size, optional):
+        if optional and not os.path.exists(path):
+            return None
+        if size is None:
+            return pygame.image.load(path)
+
+        cache_path = self.cache_path(path, size)
+        try:
+            with open(cache_path, 'rb') as f:
+                return pygame.image.frombytes(f.read(), size, 'RGBA')
+        except (OSError, ValueError):
+            pass  # Pas encore en cache (ou fichier de cache abîmé)
+
+        surface = pygame.transform.scale(pygame.image.load(path), size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_atomic(cache_path, pygame.image.tobytes(surface, 'RGBA'))
+        except OSError:
+            pass  # Le cache est une optimisation : on continue sans
+        return surface
+
+    def progress(self):
+        done = sum(future.done() for future in self.futures.values())
+        return done, len(self.futures)
+
+    def wait(self, on_progress=None):
+        """Attend la fin des chargements en appelant `on_progress(faits, total)` entre deux."""
+        pending = set(self.futures.values())
+        while pending:
+            if on_progress:
+                on_progress(*self.progress())
+            _, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+        if on_progress:
+            on_progress(*self.progress())
+        self.executor.shutdown()
+        return {name: future.result() for name, future in self.futures.items()}
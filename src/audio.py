@@ -0,0 +1,98 @@
+import random
+import numpy as np
+import pygame
+from pygame import mixer
+from constants import SFX_CHANNELS
+
+
+def make_variant(sound, pitch=1.0, volume=1.0):
+    """Copie de `sound` rééchantillonnée (hauteur) et atténuée, calculée une fois au chargement."""
+    samples = pygame.sndarray.array(sound)
+    dtype = samples.dtype
+    if pitch != 1.0:
+        # Lire les échantillons plus vite (ou moins vite) monte (ou baisse) le son
+        indices = np.arange(0, len(samples) - 1, pitch).astype(np.int64)
+        samples = samples[indices]
+    if volume != 1.0:
+        samples = samples * volume
+        if dtype.kind in 'iu':
+            samples = np.clip(samples, np.iinfo(dtype).min, np.iinfo(dtype).max)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples.astype(dtype)))
+
+
+class SoundEffect:
+    def __init__(self, variants, max_voices, min_interval, maxtime):
+        self.variants = variants
+        self.max_voices = max_voices  # Lectures simultanées au plus
+        self.min_interval = min_interval  # ms minimum entre deux lectures
+        self.maxtime = maxtime
+        self.last_played = None
+
+
+class SoundBoard:
+    """Effets sonores joués sur un groupe fixe de canaux réservés.
+
+    Les canaux réservés ne sont jamais pris par `mixer.find_channel`, et un effet
+    ne vole jamais le canal d'un autre : s'il n'y a plus de canal libre, s'il a
+    déjà `max_voices` lectures en cours ou s'il a été joué il y a moins de
+    `min_interval` ms, la lecture est simplement ignorée. Chaque effet a quelques
+    variantes (hauteur, volume) précalculées, tirées au hasard pour éviter la
+    répétition. Le volume général (le "bus") s'applique aux canaux, jamais aux
+    objets `Sound`.
+    """
+
+    def __init__(self, channels=SFX_CHANNELS, seed=None):
+        if mixer.get_num_channels() < channels:
+            mixer.set_num_channels(channels)
+        mixer.set_reserved(channels)
+        self.channels = [mixer.Channel(i) for i in range(channels)]
+        self.playing = {}  # Canal -> nom de l'effet qui y a été joué en dernier
+        self.effects = {}
+        self.rng = random.Random(seed)  # Choix des variantes, à part de l'aléatoire de la partie
+        self.volume = 1.0
+        self.muted = False
+
+    def add(self, name, sound, pitches=(1.0,), volumes=(1.0,), max_voices=2, min_interval=0, maxtime=0):
+        variants = [make_variant(sound, pitch, volume) for pitch in pitches for volume in volumes]
+        self.effects[name] = SoundEffect(variants, max_voices, min_interval, maxtime)
+
+    def bus_volume(self):
+        return 0.0 if self.muted else self.volume
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self.apply_bus()
+
+    def set_muted(self, muted):
+        self.muted = muted
+        self.apply_bus()
+
+    def apply_bus(self):
+        for channel in self.channels:
+            channel.set_volume(self.bus_volume())
+
+    def play(self, name, now=None):
+        """Joue une variante de l'effet `name` si les limites le permettent ; renvoie le canal ou None."""
+        if self.muted:
+            return None
+        effect = self.effects[name]
+        if now is None:
+            now = pygame.time.get_ticks()
+        if effect.last_played is not None and now - effect.last_played < effect.min_interval:
+            return None
+
+        free = None
+        voices = 0
+        for channel in self.channels:
+            if channel.get_busy():
+                voices += self.playing.get(channel) == name
+            elif free is None:
+                free = channel
+        if free is None or voices >= effect.max_voices:
+            return None
+
+        free.play(self.rng.choice(effect.variants), maxtime=effect.maxtime)
+        free.set_volume(self.bus_volume())  # play() remet le volume du canal à fond
+        self.playing[free] = name
+        effect.last_played = now
+        return free
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import threading
+from constants import AUTOSAVE_INTERVAL
+
+
+def write_atomic(path, data: bytes):
+    """Écrit via un fichier temporaire puis un rename : jamais de sauvegarde à moitié écrite."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.sauvegarde-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class AutosaveWorker:
+    """Sauvegarde périodique en arrière-plan.
+
+    Le thread du jeu ne fait que prendre un instantané (un dict) de l'état ;
+    la sérialisation, l'écriture et le fsync se font sur un thread à part.
+    Si plusieurs instantanés arrivent pendant une écriture, seul le dernier est gardé.
+    """
+
+    def __init__(self, write, interval=AUTOSAVE_INTERVAL):
+        self.write = write  # write(snapshot), appelé sur le thread de sauvegarde
+        self.interval = interval
+        self.last_save = None
+        self.pending = None
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="autosave", daemon=True)
+        self.thread.start()
+
+    def maybe_save(self, now, snapshot):
+        """`now` en secondes ; `snapshot()` n'est appelé que si l'intervalle est écoulé."""
+        if self.last_save is None:
+            self.last_save = now
+        elif now - self.last_save >= self.interval:
+            self.last_save = now
+            self.submit(snapshot())
+
+    def submit(self, snapshot):
+        with self.lock:
+            self.pending = snapshot
+        self.wakeup.set()
+
+    def run(self):
+        while self.running:
+            self.wakeup.wait()
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            snapshot, self.pending = self.pending, None
+            self.wakeup.clear()
+        if snapshot is not None:
+            self.write(snapshot)
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        self.thread.join()
+        self.flush()  # Au cas où un instantané serait arrivé entre-temps
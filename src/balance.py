@@ -0,0 +1,223 @@
+"""Outil d'équilibrage : simule des milliers de joueurs sur un pool de processus.
+
+Chaque joueur suit une stratégie d'achat et clique à un rythme donné (qui varie un
+peu d'un joueur à l'autre), seconde par seconde, avec les règles de simulation.py.
+On relève quand il atteint chaque poste et débloque chaque achievement, pour chaque
+combinaison des paramètres balayés :
+
+    python src/balance.py --growth 1.10 1.15 1.20 --click-rate 0 2 6 --players 200
+    python src/balance.py --promotion-scale 0.5 1 2 --strategy cheapest best_ratio --output balance.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from content import ContentPack, load_content
+from constants import CONTENT_DIR, UPGRADE_COST_GROWTH
+from simulation import Simulation
+from advisor import Advisor
+
+CLICK_RATE_SPREAD = 0.2  # Écart type relatif du rythme de clic d'un joueur à l'autre
+
+
+def affordable(sim):
+    return [upgrade for upgrade in sim.upgrades if upgrade.cost <= sim.money]
+
+
+def buy_nothing(sim, advisor, click_rate):
+    return None
+
+
+def buy_cheapest(sim, advisor, click_rate):
+    return min(affordable(sim), key=lambda upgrade: upgrade.cost, default=None)
+
+
+def buy_best_ratio(sim, advisor, click_rate):
+    return max(affordable(sim), key=lambda upgrade: upgrade.productivity_boost / upgrade.cost, default=None)
+
+
+def buy_most_expensive(sim, advisor, click_rate):
+    return max(affordable(sim), key=lambda upgrade: upgrade.cost, default=None)
+
+
+def buy_best_payback(sim, advisor, click_rate):
+    # Économise pour le meilleur temps de retour plutôt que d'acheter ce qui est abordable
+    upgrade = advisor.best()
+    return upgrade if upgrade is not None and upgrade.cost <= sim.money else None
+
+
+def buy_planned(sim, advisor, click_rate):
+    # Suit le plan (approché) de l'Advisor vers le prochain poste ; au sommet, le temps de retour
+    promotion = advisor.next_promotion()
+    if promotion is None:
+        return buy_best_payback(sim, advisor, click_rate)
+    _, purchases = advisor.plan(promotion[1], click_rate)
+    if not purchases:
+        return None
+    upgrade = purchases[0][1]
+    return upgrade if upgrade.cost <= sim.money else None
+
+
+STRATEGIES = {
+    'none': buy_nothing,
+    'cheapest': buy_cheapest,
+    'best_ratio': buy_best_ratio,
+    'expensive': buy_most_expensive,
+    'payback': buy_best_payback,
+    'plan': buy_planned,
+}
+
+
+def scaled_content(content, cost_scale=1.0, boost_scale=1.0, promotion_scale=1.0):
+    """Copie du pack avec coûts, gains des améliorations et seuils des postes multipliés."""
+    upgrades = [
+        (name, max(1, round(cost * cost_scale)), boost * boost_scale, description)
+        for name, cost, boost, description in content.upgrades
+    ]
+    promotions = {position: round(threshold * promotion_scale) for position, threshold in content.promotions.items()}
+    digest = f"{content.digest}:{cost_scale}:{boost_scale}:{promotion_scale}"
+    return ContentPack(digest, upgrades, content.story_events, content.achievements, promotions, content.effects)
+
+
+def simulate_player(content, growth, strategy, click_rate, seed, duration):
+    """Secondes auxquelles le joueur atteint chaque poste et chaque achievement."""
+    rng = random.Random(seed)
+    rate = max(0.0, rng.gauss(click_rate, click_rate * CLICK_RATE_SPREAD))
+    sim = Simulation(clock=lambda: 0, on_message=lambda *args, **kwargs: None,
+                     content=content, seed=seed, cost_growth=growth)
+    choose = STRATEGIES[strategy]
+    advisor = Advisor(sim)
+    positions = list(content.promotions)
+    milestones = {f"Poste : {sim.current_position}": 0}
+    goal = len(content.promotions) + len(content.achievements)
+    clicks_due = 0.0
+
+    for second in range(1, duration + 1):
+        t = second * 1000
+        clicks_due += rate
+        count = int(clicks_due)
+        if count:
+            clicks_due -= count
+            # Clics répartis régulièrement dans la seconde écoulée
+            sim.click_batch([t - 1000 + (i + 1) * 1000 // (count + 1) for i in range(count)])
+
+        upgrade = choose(sim, advisor, rate)
+        while upgrade is not None and sim.try_purchase_upgrade(upgrade):
+            upgrade = choose(sim, advisor, rate)
+        sim.update(t)
+
+        # Une promotion peut sauter des postes : ceux d'en dessous comptent comme atteints
+        for position in positions[:positions.index(sim.current_position) + 1]:
+            milestones.setdefault(f"Poste : {position}", second)
+        for achievement in sim.achievements:
+            if achievement.unlocked:
+                milestones.setdefault(f"Achievement : {achievement.title}", second)
+        if len(milestones) == goal:
+            break
+    return milestones
+
+
+CONTENT = None  # Pack de base, chargé une fois par processus
+SCALED = {}
+
+
+def init_worker(content_dir):
+    global CONTENT
+    CONTENT = load_content(content_dir)
+
+
+def run_batch(config, strategy, click_rate, seeds, duration):
+    key = (config['cost_scale'], config['boost_scale'], config['promotion_scale'])
+    if key not in SCALED:
+        SCALED[key] = scaled_content(CONTENT, *key)
+    return [simulate_player(SCALED[key], config['growth'], strategy, click_rate, seed, duration) for seed in seeds]
+
+
+def summarize(results, milestone_names):
+    summary = {}
+    for name in milestone_names:
+        times = sorted(result[name] for result in results if name in result)
+        entry = {'reached': len(times) / len(results)}
+        if times:
+            cuts = statistics.quantiles(times, n=10, method='inclusive') if len(times) > 1 else times * 9
+            entry.update({'p10': cuts[0], 'p50': cuts[4], 'p90': cuts[8]})
+        summary[name] = entry
+    return summary
+
+
+def format_minutes(seconds):
+    return f"{seconds / 60:7.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--strategy', nargs='+', choices=sorted(STRATEGIES), default=['cheapest', 'best_ratio'])
+    parser.add_argument('--click-rate', nargs='+', type=float, default=[0.0, 2.0, 6.0], help="clics par seconde")
+    parser.add_argument('--growth', nargs='+', type=float, default=[UPGRADE_COST_GROWTH], help="croissance du coût par niveau")
+    parser.add_argument('--cost-scale', nargs='+', type=float, default=[1.0], help="multiplicateur des coûts de base")
+    parser.add_argument('--boost-scale', nargs='+', type=float, default=[1.0], help="multiplicateur des gains par seconde")
+    parser.add_argument('--promotion-scale', nargs='+', type=float, default=[1.0], help="multiplicateur des seuils de promotion")
+    parser.add_argument('--players', type=int, default=100, help="joueurs simulés par combinaison")
+    parser.add_argument('--minutes', type=int, default=120, help="durée de jeu simulée par joueur")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processus en parallèle")
+    parser.add_argument('--chunk', type=int, default=25, help="joueurs par tâche envoyée au pool")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--content', default=CONTENT_DIR)
+    parser.add_argument('--output', help="fichier JSON où écrire les distributions")
+    args = parser.parse_args()
+
+    content = load_content(args.content)
+    milestone_names = ([f"Poste : {position}" for position in content.promotions] +
+                       [f"Achievement : {achievement.title}" for achievement in content.achievements])
+    configs = [
+        {'growth': growth, 'cost_scale': cost, 'boost_scale': boost, 'promotion_scale': promotion}
+        for growth, cost, boost, promotion in itertools.product(
+            args.growth, args.cost_scale, args.boost_scale, args.promotion_scale)
+    ]
+    # Les mêmes graines pour chaque combinaison : les écarts viennent des paramètres, pas du hasard
+    seeds = [args.seed + i for i in range(args.players)]
+    groups = list(itertools.product(range(len(configs)), args.strategy, args.click_rate))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(args.content,)) as pool:
+        futures = {
+            group: [
+                pool.submit(run_batch, configs[group[0]], group[1], group[2], seeds[i:i + args.chunk], args.minutes * 60)
+                for i in range(0, len(seeds), args.chunk)
+            ]
+            for group in groups
+        }
+        report = []
+        for (config_index, strategy, click_rate), batch in futures.items():
+            results = [result for future in batch for result in future.result()]
+            report.append({
+                'config': configs[config_index],
+                'strategy': strategy,
+                'click_rate': click_rate,
+                'players': len(results),
+                'milestones': summarize(results, milestone_names),
+            })
+    elapsed = time.perf_counter() - start
+
+    for group in report:
+        config = group['config']
+        print(f"\ncroissance {config['growth']}  coûts x{config['cost_scale']}  gains x{config['boost_scale']}  "
+              f"postes x{config['promotion_scale']}  |  {group['strategy']}  |  {group['click_rate']} clics/s")
+        print(f"  {'':40} {'atteint':>8} {'p10':>7} {'p50':>7} {'p90':>7}  (minutes)")
+        for name, entry in group['milestones'].items():
+            times = ' '.join(format_minutes(entry[p]) for p in ('p10', 'p50', 'p90')) if 'p50' in entry else ''
+            print(f"  {name[:40]:40} {entry['reached']:8.0%} {times}".rstrip())
+    total = len(groups) * args.players
+    print(f"\n{total} joueurs simulés ({args.minutes} min chacun) en {elapsed:.1f} s sur {args.workers} processus")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': vars(args), 'groups': report}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # constants.py
+import os
 # Window settings
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
@@ -23,4 +24,51 @@ UPGRADE_SPACING = 70
 ICON_SIZE = (32, 32)
 BANNER_SIZE = (300, 60)
 BUTTON_SIZE = (200, 60)
-BAR_SIZE = (200, 20)
\ No newline at end of file
+BAR_SIZE = (200, 20)
+
+# Progression hors-ligne
+OFFLINE_EARNINGS = True  # Créditer le revenu passif accumulé depuis la dernière sauvegarde
+
+# Améliorations
+UPGRADE_COST_GROWTH = 1.15  # Le coût est multiplié (puis tronqué) à chaque niveau acheté
+BUY_QUANTITIES = [1, 10, 100, 'max']  # Modes d'achat proposés dans le panneau
+UPGRADE_ROW_HEIGHT = 90  # Hauteur d'une ligne de la liste (bouton de 80 px + marge)
+UPGRADE_SCROLL_STEP = 60  # Pixels défilés par cran de molette
+
+# Rendu
+TEXT_CACHE_SIZE = 512  # Nombre max de surfaces de texte gardées en cache (LRU)
+PARTICLE_CAPACITY = 1024  # Taille initiale des tableaux de particules (doublée au besoin)
+CLICK_PARTICLES_PER_FRAME = 25  # Particules créées au plus par frame pour les clics (5 par clic affiché)
+RENDER_FPS = 60  # Plafond d'images par seconde (la vitesse du jeu n'en dépend pas)
+IDLE_FPS = 5  # Cadence quand rien n'est animé (pas de particules, d'animation ni de message)
+BACKGROUND_FPS = 1  # Cadence quand la fenêtre est réduite ou n'a pas le focus
+ACTIVE_GRACE_MS = 1000  # Pleine cadence pendant ce délai après une entrée du joueur
+CLICK_ANIMATION_MS = 166  # Durée de l'animation du document au clic (rétréci pendant la première moitié)
+MESSAGE_CAPACITY = 5  # Messages gardés en attente au plus (les plus anciens hors 'story' partent d'abord)
+
+# Simulation à pas fixe
+SIM_STEP_MS = 1000 / 60  # Durée d'un pas : les particules avancent d'un pas à la fois
+MAX_SIM_STEPS = 300  # Pas rattrapés au plus par frame (5 s) ; au-delà, le retard est abandonné
+
+# Effets sonores
+SFX_CHANNELS = 4  # Canaux du mixer réservés aux effets sonores
+CLICK_SOUND_VOICES = 3  # Sons de clic joués en même temps au plus
+CLICK_SOUND_INTERVAL = 40  # ms minimum entre deux sons de clic
+
+# Sauvegarde
+SAVE_FILE = 'sauvegarde.json'
+AUTOSAVE_INTERVAL = 30  # Secondes entre deux sauvegardes automatiques
+BINARY_SAVE_FILE = 'sauvegarde.bin'
+SAVE_FORMAT = 'binary'  # 'binary' (compact, versionné) ou 'json'
+
+# Chargement des ressources
+ASSET_CACHE_DIR = os.path.join('.cache', 'assets')  # Images déjà mises à l'échelle, par résolution
+ASSET_WORKERS = 4
+
+# Contenu (améliorations, events, achievements, postes)
+CONTENT_DIR = 'content'
+CONTENT_CACHE_DIR = os.path.join('.cache', 'content')  # Packs compilés, indexés par hash du contenu
+CONTENT_POLL_INTERVAL = 1.0  # Secondes entre deux vérifications des fichiers (rechargement à chaud) ; 0 pour désactiver
+
+# Profilage (F3 : overlay, F4 : export CSV / Chrome trace)
+PROFILER_FRAMES = 600  # Frames gardées par le profileur (10 s à 60 FPS)
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""Contenu du jeu chargé depuis des fichiers JSON (dossier content/).
+
+    upgrades.json      : name, cost, productivity_boost, description
+    story_events.json  : title, description, trigger_value, event_type (+ display_duration)
+    achievements.json  : title, description, condition_type, condition_value, reward
+    promotions.json    : position, threshold (dans l'ordre de la carrière)
+
+Postes et achievements peuvent porter une liste `effects` de modificateurs
+permanents (voir effects.py), actifs une fois le poste atteint ou l'achievement
+débloqué : {"target": "click" | "passive" | nom d'une amélioration, "add": 0, "mult": 1}.
+
+Les fichiers sont validés puis compilés en un `ContentPack` (objets prêts à copier et
+index par nom), gardé sur disque avec pickle sous le hash du contenu : tant que les
+fichiers ne changent pas, les lancements suivants relisent le pack sans reparser ni
+revalider le JSON.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+from dataclasses import replace
+from models import Upgrade
+from story_events import StoryEvent
+from achievements import Achievement
+from effects import CLICK, PASSIVE, Modifier
+from autosave import write_atomic
+from constants import CONTENT_DIR, CONTENT_CACHE_DIR
+
+CONTENT_FILES = ('upgrades', 'story_events', 'achievements', 'promotions')
+PACK_VERSION = 2  # À incrémenter quand la forme du pack change : les anciens caches sont ignorés
+METRICS = ('money', 'clicks', 'upgrades', 'money_earned')
+NUMBER = (int, float)
+TYPE_NAMES = {str: "un texte", NUMBER: "un nombre", list: "une liste", dict: "un objet"}
+
+
+class ContentError(ValueError):
+    pass
+
+
+class ContentPack:
+    def __init__(self, digest, upgrades, story_events, achievements, promotions, effects=None):
+        self.digest = digest
+        self.upgrades = upgrades  # (name, cost, productivity_boost, description)
+        self.story_events = story_events  # Modèles à copier, jamais modifiés
+        self.achievements = achievements
+        self.promotions = promotions  # Poste -> seuil, dans l'ordre de la carrière
+        self.effects = effects or {}  # 'promotion:<poste>' / 'achievement:<titre>' -> [Modifier]
+
+        self.upgrade_index = {spec[0]: i for i, spec in enumerate(upgrades)}
+        self.story_index = {event.title: i for i, event in enumerate(story_events)}
+        self.achievement_index = {achievement.title: i for i, achievement in enumerate(achievements)}
+
+    def new_upgrades(self):
+        return [Upgrade(*spec) for spec in self.upgrades]
+
+    def new_story_events(self):
+        return [replace(event) for event in self.story_events]
+
+    def new_achievements(self):
+        return [replace(achievement) for achievement in self.achievements]
+
+    def new_effects(self, source):
+        return [replace(modifier) for modifier in self.effects.get(source, ())]
+
+
+def read_files(directory):
+    raw = {}
+    for name in CONTENT_FILES:
+        with open(os.path.join(directory, f"{name}.json"), 'rb') as f:
+            raw[name] = f.read()
+    return raw
+
+
+def content_digest(raw):
+    digest = hashlib.sha1(str(PACK_VERSION).encode())
+    for name in CONTENT_FILES:
+        digest.update(name.encode() + b'\0' + raw[name] + b'\0')
+    return digest.hexdigest()
+
+
+def content_mtimes(directory=CONTENT_DIR):
+    """Dates de modification des fichiers, pour détecter un changement sans les relire."""
+    mtimes = []
+    for name in CONTENT_FILES:
+        try:
+            mtimes.append(os.stat(os.path.join(directory, f"{name}.json")).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def check_type(name, i, field, value, expected):
+    # bool est un int pour Python, pas pour le contenu
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise ContentError(f"{name}.json, entrée {i} : {field} doit être {TYPE_NAMES[expected]}, pas {value!r}")
+
+
+def entries(raw, name, fields, optional=None):
+    """Entrées de `name`.json, avec le type de chaque champ vérifié (champ -> type attendu)."""
+    try:
+        data = json.loads(raw[name])
+    except ValueError as e:  # JSON invalide, ou fichier qui n'est pas en UTF-8
+        raise ContentError(f"{name}.json : JSON invalide ({e})")
+    if not isinstance(data, list):
+        raise ContentError(f"{name}.json : une liste est attendue")
+    for i, entry in enumerate(data):
+        check_type(name, i, "l'entrée", entry, dict)
+        missing = [field for field in fields if field not in entry]
+        if missing:
+            raise ContentError(f"{name}.json, entrée {i} : champ(s) manquant(s) {', '.join(missing)}")
+        for field, expected in fields.items():
+            check_type(name, i, field, entry[field], expected)
+        for field, expected in (optional or {}).items():
+            if field in entry:
+                check_type(name, i, field, entry[field], expected)
+        yield i, entry
+
+
+def check_metric(name, i, metric):
+    if metric not in METRICS:
+        raise ContentError(f"{name}.json, entrée {i} : métrique inconnue {metric!r}")
+
+
+def compile_effects(name, i, entry, source, targets):
+    modifiers = []
+    for j, effect in enumerate(entry.get('effects', [])):
+        check_type(name, i, f"effects[{j}]", effect, dict)
+        if not isinstance(effect.get('target'), str) or effect['target'] not in targets:
+            raise ContentError(f"{name}.json, entrée {i} : cible d'effet inconnue {effect.get('target')!r}")
+        for field in ('add', 'mult'):
+            if field in effect:
+                check_type(name, i, f"effects[{j}].{field}", effect[field], NUMBER)
+        modifiers.append(Modifier(effect['target'], effect.get('add', 0.0), effect.get('mult', 1.0), source))
+    return modifiers
+
+
+def compile_content(raw, digest):
+    upgrades = []
+    for i, entry in entries(raw, 'upgrades', {'name': str, 'cost': NUMBER, 'productivity_boost': NUMBER, 'description': str}):
+        if entry['cost'] <= 0:
+            raise ContentError(f"upgrades.json, entrée {i} : le coût doit être positif")
+        upgrades.append((entry['name'], entry['cost'], entry['productivity_boost'], entry['description']))
+
+    story_events = []
+    for i, entry in entries(raw, 'story_events', {'title': str, 'description': str, 'trigger_value': NUMBER},
+                            {'event_type': str, 'display_duration': NUMBER}):
+        event = StoryEvent(entry['title'], entry['description'], entry['trigger_value'],
+                           entry.get('event_type', 'money'), display_duration=entry.get('display_duration', 5000))
+        check_metric('story_events', i, event.event_type)
+        story_events.append(event)
+
+    targets = {CLICK, PASSIVE} | {spec[0] for spec in upgrades}
+    effects = {}
+    achievements = []
+    fields = {'title': str, 'description': str, 'condition_type': str, 'condition_value': NUMBER, 'reward': NUMBER}
+    for i, entry in entries(raw, 'achievements', fields, {'effects': list}):
+        check_metric('achievements', i, entry['condition_type'])
+        achievements.append(Achievement(entry['title'], entry['description'], entry['condition_type'],
+                                        entry['condition_value'], entry['reward']))
+        source = f"achievement:{entry['title']}"
+        effects[source] = compile_effects('achievements', i, entry, source, targets)
+
+    promotions = {}
+    previous = None
+    for i, entry in entries(raw, 'promotions', {'position': str, 'threshold': NUMBER}, {'effects': list}):
+        # check_triggers garde la dernière promotion franchie : l'ordre du fichier doit être celui des seuils
+        if previous is not None and entry['threshold'] <= previous:
+            raise ContentError(f"promotions.json, entrée {i} : les seuils doivent être croissants")
+        if entry['position'] in promotions:
+            raise ContentError("promotions.json : noms en double")
+        promotions[entry['position']] = entry['threshold']
+        previous = entry['threshold']
+        source = f"promotion:{entry['position']}"
+        effects[source] = compile_effects('promotions', i, entry, source, targets)
+
+    for name, titles in (('upgrades', [spec[0] for spec in upgrades]),
+                         ('story_events', [event.title for event in story_events]),
+                         ('achievements', [achievement.title for achievement in achievements])):
+        if len(set(titles)) != len(titles):
+            raise ContentError(f"{name}.json : noms en double")
+
+    effects = {source: modifiers for source, modifiers in effects.items() if modifiers}
+    return ContentPack(digest, upgrades, story_events, achievements, promotions, effects)
+
+
+def load_content(directory=CONTENT_DIR, cache_dir=CONTENT_CACHE_DIR):
+    """Pack compilé du contenu de `directory`, relu depuis le cache s'il est à jour."""
+    raw = read_files(directory)
+    digest = content_digest(raw)
+    cache_path = os.path.join(cache_dir, f"{digest}.pickle")
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass  # Pas encore compilé (ou cache abîmé)
+
+    pack = compile_content(raw, digest)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(cache_path, pickle.dumps(pack, pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # Le cache est une optimisation : on continue sans
+    return pack
+
+
+if __name__ == "__main__":
+    # python content.py [dossier] : valide le contenu et affiche un résumé
+    raw = read_files(sys.argv[1] if len(sys.argv) > 1 else CONTENT_DIR)
+    try:
+        pack = compile_content(raw, content_digest(raw))
+    except ContentError as e:
+        sys.exit(f"Contenu invalide : {e}")
+    print(f"{pack.digest[:12]} : {len(pack.upgrades)} améliorations, {len(pack.story_events)} events, "
+          f"{len(pack.achievements)} achievements, {len(pack.promotions)} postes, "
+          f"{sum(map(len, pack.effects.values()))} effets")
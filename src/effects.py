@@ -0,0 +1,111 @@
+import heapq
+from dataclasses import dataclass
+from typing import Optional
+
+CLICK, PASSIVE = 'click', 'passive'
+
+
+@dataclass
+class Modifier:
+    target: str  # CLICK, PASSIVE ou le nom d'une amélioration
+    add: float = 0.0  # En € par clic / par seconde ; pour une amélioration, par niveau
+    mult: float = 1.0
+    source: str = ''  # 'promotion:<poste>', 'achievement:<titre>', 'buff:<nom>'...
+    expires_at: Optional[int] = None  # ms (horloge de la simulation), None : permanent
+
+
+class EffectEngine:
+    """Modificateurs de revenu : additifs, multiplicatifs, temporaires ou permanents.
+
+    Gain par clic = (valeur de base + ajouts) × multiplicateurs, et revenu passif
+    = (Σ (gain par niveau + ajouts) × niveaux × multiplicateurs de l'amélioration
+    + ajouts) × multiplicateurs. Les deux taux sont gardés en cache et recalculés
+    seulement quand un modificateur arrive, part ou expire, ou quand la simulation
+    signale un changement (achat, chargement) avec `invalidate` : jamais par frame.
+    Les expirations sont dans un tas, la prochaine se lit en O(1).
+    """
+
+    def __init__(self):
+        self.modifiers = {}  # Handle -> Modifier
+        self.expiries = []  # Tas de (expires_at, handle)
+        self.next_handle = 0
+        self.version = 0  # Change avec l'ensemble des modificateurs (pas avec les achats)
+        self.factors = None
+        self.rates = None
+
+    def add(self, modifier):
+        handle = self.next_handle
+        self.next_handle += 1
+        self.modifiers[handle] = modifier
+        if modifier.expires_at is not None:
+            heapq.heappush(self.expiries, (modifier.expires_at, handle))
+        self.changed()
+        return handle
+
+    def remove(self, handle):
+        # L'entrée éventuelle dans le tas des expirations est ignorée quand elle sort
+        if self.modifiers.pop(handle, None) is not None:
+            self.changed()
+
+    def remove_source(self, prefix):
+        handles = [handle for handle, modifier in self.modifiers.items() if modifier.source.startswith(prefix)]
+        for handle in handles:
+            del self.modifiers[handle]
+        if handles:
+            self.changed()
+
+    def next_expiry(self):
+        while self.expiries and self.expiries[0][1] not in self.modifiers:
+            heapq.heappop(self.expiries)
+        return self.expiries[0][0] if self.expiries else None
+
+    def expire(self, now):
+        """Retire les modificateurs expirés à `now` et les renvoie."""
+        expired = []
+        while self.expiries and self.expiries[0][0] <= now:
+            _, handle = heapq.heappop(self.expiries)
+            modifier = self.modifiers.pop(handle, None)
+            if modifier is not None:
+                expired.append(modifier)
+        if expired:
+            self.changed()
+        return expired
+
+    def changed(self):
+        self.version += 1
+        self.factors = None
+        self.rates = None
+
+    def invalidate(self):
+        """Les niveaux des améliorations ou la valeur de clic de base ont changé."""
+        self.rates = None
+
+    def get_factors(self):
+        """Cible -> (somme des ajouts, produit des multiplicateurs)."""
+        if self.factors is None:
+            factors = {}
+            for modifier in self.modifiers.values():
+                add, mult = factors.get(modifier.target, (0.0, 1.0))
+                factors[modifier.target] = (add + modifier.add, mult * modifier.mult)
+            self.factors = factors
+        return self.factors
+
+    def get_rates(self, click_value, upgrades):
+        """(gain par clic hors combo, revenu passif par seconde), depuis le cache si possible."""
+        if self.rates is None:
+            factors = self.get_factors()
+            click_add, click_mult = factors.get(CLICK, (0.0, 1.0))
+            passive_add, passive_mult = factors.get(PASSIVE, (0.0, 1.0))
+            passive = 0.0
+            for upgrade in upgrades:
+                if upgrade.count:
+                    add, mult = factors.get(upgrade.name, (0.0, 1.0))
+                    passive += (upgrade.total_boost() + add * upgrade.count) * mult
+            self.rates = ((click_value + click_add) * click_mult, (passive + passive_add) * passive_mult)
+        return self.rates
+
+    def level_rate(self, upgrade):
+        """Revenu passif apporté par un niveau de plus de `upgrade`."""
+        factors = self.get_factors()
+        add, mult = factors.get(upgrade.name, (0.0, 1.0))
+        return (upgrade.productivity_boost + add) * mult * factors.get(PASSIVE, (0.0, 1.0))[1]
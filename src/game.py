@@ -1,18 +1,34 @@
 import pygame
 import sys
 import os
-from pygame import mixer
-import random
 import math
-from typing import List, Dict
 import json
-from models import Upgrade
-from game_data import PROMOTION_LEVELS, CLICK_MESSAGES
-from story_events import initialize_story_events, StoryEvent
-from achievements import ACHIEVEMENTS, Achievement
+import struct
+import time
+from game_data import CLICK_MESSAGES
+from simulation import Simulation
+from constants import BUY_QUANTITIES, SAVE_FILE, BINARY_SAVE_FILE, SAVE_FORMAT, RENDER_FPS, SIM_STEP_MS, MAX_SIM_STEPS
+from constants import IDLE_FPS, BACKGROUND_FPS, ACTIVE_GRACE_MS, CLICK_PARTICLES_PER_FRAME, CLICK_ANIMATION_MS
+from constants import MESSAGE_CAPACITY
+from constants import CLICK_SOUND_VOICES, CLICK_SOUND_INTERVAL, CONTENT_POLL_INTERVAL
+from pricing import BUY_MAX
+from text_cache import TextCache
+from renderer import DirtyRenderer
+from particles import ParticleSystem
+from autosave import AutosaveWorker, write_atomic
+from assets import AssetLoader
+from profiler import FrameProfiler
+from audio import SoundBoard
+from upgrade_list import UpgradeList
+from content import ContentError, load_content, content_mtimes
+from replay import Recorder
+from advisor import Advisor
+from timers import TimerScheduler
+from notifications import NotificationQueue
+import save_format
 
 class BusinessClicker:
-    def __init__(self):
+    def __init__(self, record_path=None):
         pygame.init()
         pygame.mixer.init()
         
@@ -22,45 +38,51 @@ class BusinessClicker:
         self.height = self.screen.get_height()
         pygame.display.set_caption("Business Clicker")
         
-        # État du jeu
-        self.money = 0
-        self.click_value = 1
-        self.passive_income = 0
-        self.last_passive_update = pygame.time.get_ticks()
-        self.score_multiplier = 1.0
-        self.combo_counter = 0
-        self.last_click_time = 0
-        self.combo_timeout = 1000  # En millisecondes
+        # État du jeu : les règles vivent dans la simulation, pilotée par l'horloge pygame
+        self.sim = Simulation(clock=pygame.time.get_ticks, on_message=self.add_message)
+        self.advisor = Advisor(self.sim)  # Meilleur prochain achat, mis en valeur dans le panneau
         
         # Configuration de l'interface
         self.font_large = pygame.font.Font(None, 64)
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
+        self.text_cache = TextCache()
         
         # Initialisation des systèmes de jeu
-        self.upgrades = self.initialize_upgrades()
-        self.story_events = initialize_story_events()
-        self.achievements = ACHIEVEMENTS
-        self.promotion_levels = PROMOTION_LEVELS
         self.click_messages = CLICK_MESSAGES
         self.selected_upgrade = None
-        self.current_position = "Stagiaire"
+        self.content_mtimes = content_mtimes()
+        self.last_content_check = time.monotonic()
+        self.pending_clicks = []  # (horodatage, position) des clics sur le document de la frame
+        self.buy_mode = BUY_QUANTITIES[0]  # Nombre de niveaux achetés par clic (ou BUY_MAX)
         
         # États et queues
         self.active_events = []
-        self.messages_queue = []
+        self.notifications = NotificationQueue(MESSAGE_CAPACITY)
+        self.timers = TimerScheduler()  # Timers de l'affichage, séparés de ceux de la simulation
+        self.message_timer = None  # Fin du prochain message
+        self.word_widths = {}  # (police, mot) -> largeur en pixels
         
         # Animation et particules
         self.click_animation = False
-        self.animation_frame = 0
-        self.animation_max_frame = 10
-        self.particles = []
+        self.animation_timer = None  # Prochaine étape de l'animation
+        self.particles = ParticleSystem(seed=self.sim.seed)
+        self.interpolation = 1.0  # Fraction du pas de simulation écoulée au moment du dessin
+        
+        # Profilage : toujours actif, l'overlay (F3) ne fait que l'afficher
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.last_text_renders = 0
         
         self.music_volume = 0.5
         self.sound_volume = 0.2
         self.music_enabled = True
         self.sound_enabled = True
 
+        # Cadence d'affichage : pleine vitesse seulement quand quelque chose bouge
+        self.window_active = True
+        self.last_input_time = 0
+
         # Menu de pause
         self.paused = False
         self.pause_menu_options = [
@@ -72,21 +94,18 @@ class BusinessClicker:
             "Quitter"
         ]
         self.selected_option = 0
-
-
-        # Statistiques
-        self.stats = {
-            'total_clicks': 0,
-            'total_money_earned': 0,
-            'total_upgrades_bought': 0
-        }
         
 
         # Chargement des ressources et configuration UI
         self.load_assets()
         self.setup_ui()
+        self.setup_renderer()
         self.load_music()
         self.load_game() # Si il y a une sauvegarde
+        self.autosave = AutosaveWorker(self.write_save)
+        
+        # Enregistrement des entrées (main.py --record), à rejouer avec replay.py
+        self.recorder = Recorder(record_path, self.sim) if record_path else None
 
 
     def load_music(self):
@@ -109,10 +128,7 @@ class BusinessClicker:
 
     def toggle_sound(self):
         self.sound_enabled = not self.sound_enabled
-        if self.sound_enabled:
-            self.click_sound.set_volume(self.sound_volume)
-        else:
-            self.click_sound.set_volume(0)
+        self.sounds.set_muted(not self.sound_enabled)
         
         self.pause_menu_options[2] = f"Sons: {'On' if self.sound_enabled else 'Off'}"
 
@@ -125,7 +141,7 @@ class BusinessClicker:
             self.sound_volume = max(0.0, self.sound_volume - 0.1)
         
         pygame.mixer.music.set_volume(self.music_volume)
-        self.click_sound.set_volume(self.sound_volume if self.sound_enabled else 0)
+        self.sounds.set_volume(self.sound_volume)
 
     def draw_pause_menu(self):
         if not self.paused:
@@ -137,7 +153,7 @@ class BusinessClicker:
         self.screen.blit(overlay, (0, 0))
         
         # Titre du menu
-        title_text = self.font_large.render("BUSINESS SCLICKER", True, (255, 255, 255))
+        title_text = self.text_cache.render(self.font_large, "BUSINESS SCLICKER", (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.width // 2, self.height // 4))
         self.screen.blit(title_text, title_rect)
         
@@ -159,7 +175,7 @@ class BusinessClicker:
                 else:
                     color = (255, 255, 255)  # Blanc pour les options non sélectionnées
             
-            option_text = self.font_medium.render(option, True, color)
+            option_text = self.text_cache.render(self.font_medium, option, color)
             option_rect = option_text.get_rect(
                 center=(self.width // 2, self.height // 2 + i * 50)
             )
@@ -202,74 +218,180 @@ class BusinessClicker:
         elif option == "Volume -":
             self.adjust_volume(False)
         elif option == "Quitter":
+            self.autosave.stop()
+            self.stop_recording()
             self.save_game()
             pygame.quit()
             sys.exit()
 
-    def initialize_upgrades(self) -> List[Upgrade]:
-        return [
-            Upgrade("Machine à Café", 10, 0.1, "Un petit café pour la productivité"),
-            Upgrade("Stagiaire", 50, 0.5, "Il fait de son mieux..."),
-            Upgrade("Ordinateur de Bureau", 200, 2, "Traitement des dossiers plus rapide"),
-            Upgrade("Scanner Automatique", 1000, 10, "Scanne les documents tout seul"),
-            Upgrade("Assistant IA", 5000, 50, "Productivité nouvelle génération"),
-            Upgrade("Bureau Privé", 10000, 100, "Un espace rien que pour vous"),
-            Upgrade("Secrétaire Personnel", 20000, 200, "Gère vos rendez-vous et appels"),
-            Upgrade("Jet Privé", 100000, 1000, "Voyages d'affaires en un clin d'œil"),
-        ]
-
     def load_assets(self):
-        self.background = pygame.image.load(os.path.join('assets', 'images', 'office_background.png'))
-        self.background = pygame.transform.scale(self.background, (self.width, self.height))
-        
+        # Décodage en parallèle derrière un écran de chargement, conversion sur le thread principal
+        loader = AssetLoader()
         document_size = int(self.height * 0.20)
-        original_document = pygame.image.load(os.path.join('assets', 'images', 'document_pixel.png'))
-        self.document = pygame.transform.scale(original_document, (document_size, document_size))
+        loader.image('background', os.path.join('assets', 'images', 'office_background.png'), (self.width, self.height))
+        loader.image('document', os.path.join('assets', 'images', 'document_pixel.png'), (document_size, document_size))
+        loader.sound('click', os.path.join('assets', 'sounds', 'paper_shuffle.wav'))
+        for upgrade in self.sim.upgrades:
+            loader.image(('icon', upgrade.name), self.upgrade_icon_path(upgrade), optional=True)
+        assets = loader.wait(self.draw_loading_screen)
+        
+        self.background = assets['background'].convert()
+        self.document = assets['document'].convert_alpha()
         self.document_rect = self.document.get_rect(center=(self.width // 2, self.height // 2))
         
-        self.click_sound = mixer.Sound(os.path.join('assets', 'sounds', 'paper_shuffle.wav'))
-        self.click_sound.set_volume(0.2)
+        # Variantes du son de clic (hauteur, volume) calculées une fois pour toutes
+        self.sounds = SoundBoard(seed=self.sim.seed)
+        self.sounds.add(
+            'click', assets['click'], pitches=(0.94, 1.0, 1.06), volumes=(0.85, 1.0),
+            max_voices=CLICK_SOUND_VOICES, min_interval=CLICK_SOUND_INTERVAL, maxtime=500
+        )
+        self.sounds.set_volume(self.sound_volume)
         
         self.upgrade_icons = {}
-        for upgrade in self.upgrades:
-            icon_path = os.path.join('assets', 'images', f'{upgrade.name.lower().replace(" ", "_")}.png')
-            if os.path.exists(icon_path):
-                self.upgrade_icons[upgrade.name] = pygame.image.load(icon_path)
-            else:
-                icon = pygame.Surface((32, 32))
-                icon.fill((random.randint(100, 255), random.randint(100, 255), random.randint(100, 255)))
-                self.upgrade_icons[upgrade.name] = icon
+        for upgrade in self.sim.upgrades:
+            self.upgrade_icons[upgrade.name] = self.make_upgrade_icon(assets[('icon', upgrade.name)])
+
+    def upgrade_icon_path(self, upgrade):
+        return os.path.join('assets', 'images', f'{upgrade.name.lower().replace(" ", "_")}.png')
+
+    def make_upgrade_icon(self, icon):
+        if icon is not None:
+            return icon.convert_alpha()
+        # Pas d'image pour cette amélioration : un carré de couleur
+        icon = pygame.Surface((32, 32)).convert()
+        rng = self.sim.rng
+        icon.fill((rng.randint(100, 255), rng.randint(100, 255), rng.randint(100, 255)))
+        return icon
+
+    def reload_content(self):
+        """Recharge content/ en cours de partie (F5, ou quand un fichier change)."""
+        if self.recorder:
+            # Le rejeu repart du contenu de départ : il ne doit pas changer en cours d'enregistrement
+            self.add_message("Contenu non rechargé", "Pas de rechargement pendant un enregistrement (--record).", priority='story')
+            return
+        try:
+            pack = load_content()
+        except (OSError, ContentError) as e:
+            self.add_message("Contenu non rechargé", str(e), priority='story')
+            return
+        if pack.digest == self.sim.content.digest:
+            return
+        self.sim.apply_content(pack)
+        
+        for upgrade in self.sim.upgrades:
+            if upgrade.name not in self.upgrade_icons:
+                path = self.upgrade_icon_path(upgrade)
+                self.upgrade_icons[upgrade.name] = self.make_upgrade_icon(
+                    pygame.image.load(path) if os.path.exists(path) else None
+                )
+        scroll = self.upgrade_list.scroll
+        self.setup_ui()
+        self.upgrade_list.scroll_by(scroll)
+        self.renderer.invalidate()
+        self.add_message("Contenu rechargé", "Améliorations, events, achievements et postes sont à jour.", 3000, 'story')
+
+    def draw_loading_screen(self, done, total):
+        pygame.event.pump()  # Garder la fenêtre réactive pendant le chargement
+        self.screen.fill((30, 30, 30))
+        text = self.font_medium.render(f"Chargement... {done}/{total}", True, (255, 255, 255))
+        self.screen.blit(text, text.get_rect(center=(self.width // 2, self.height // 2 - 30)))
+        bar = pygame.Rect(0, 0, 300, 20)
+        bar.center = (self.width // 2, self.height // 2 + 10)
+        pygame.draw.rect(self.screen, (200, 200, 200), bar, 2)
+        if total:
+            pygame.draw.rect(self.screen, (100, 200, 100), (bar.x + 2, bar.y + 2, (bar.width - 4) * done // total, bar.height - 4))
+        pygame.display.flip()
 
     def setup_ui(self):
         self.upgrade_region = pygame.Rect(self.width - 400, 0, 400, self.height)  # Largeur augmentée à 400
         self.stats_region = pygame.Rect(0, 0, 300, 100)
         
-        self.upgrade_buttons = []
-        for i, upgrade in enumerate(self.upgrades):
-            button_rect = pygame.Rect(
-                self.upgrade_region.x + 10,
-                100 + i * 90,
-                380,
-                80
-            )
-            self.upgrade_buttons.append((button_rect, upgrade))
+        # Liste défilante : seules les lignes visibles sont dessinées
+        list_viewport = pygame.Rect(self.upgrade_region.x + 10, 100, 380, self.height - 110)
+        self.upgrade_list = UpgradeList(list_viewport, self.sim.upgrades)
 
+        # Sélecteur x1 / x10 / x100 / Max à droite du titre du panneau
+        self.buy_mode_buttons = []
+        for i, quantity in enumerate(BUY_QUANTITIES):
+            mode_rect = pygame.Rect(self.upgrade_region.x + 190 + i * 50, 45, 45, 30)
+            self.buy_mode_buttons.append((mode_rect, quantity))
 
-    def check_promotion(self):
-        highest_position = self.current_position # Plus haut poste
-        for position, threshold in sorted(self.promotion_levels.items(), key=lambda x: x[1]):
-            if self.money >= threshold:
-                highest_position = position
-                
-        if highest_position != self.current_position:
-            self.current_position = highest_position
-            self.add_message(
-                f"Promotion !",
-                f"Félicitations ! Vous êtes promu {highest_position}. Nouveaux avantages débloqués !"
-            )
-            return True
-        return False
 
+    def setup_renderer(self):
+        self.renderer = DirtyRenderer(self.screen, self.background)
+        screen_rect = self.screen.get_rect()
+        stats_rects = [pygame.Rect(0, 0, 500, 200), pygame.Rect(0, self.height - 100, 500, 80)]
+        
+        # Couches dans l'ordre de dessin, avec la zone qu'elles occupent
+        timed = self.profiler.wrap
+        self.renderer.add_layer(
+            'document', timed('draw_document', self.draw_document),
+            lambda: [pygame.Rect(self.document_rect.topleft, self.document.get_size())]
+        )
+        self.renderer.add_layer(
+            'upgrades', timed('draw_upgrade_panel', self.draw_upgrade_panel),
+            lambda: [self.upgrade_region], self.upgrade_panel_signature
+        )
+        self.renderer.add_layer('stats', timed('draw_stats', self.draw_stats), lambda: stats_rects, self.stats_signature)
+        self.renderer.add_layer('particles', timed('draw_particles', self.draw_particles), self.particles_bounds)
+        self.renderer.add_layer(
+            'messages', timed('draw_messages', self.draw_messages),
+            lambda: [self.displayed_message()['rect']] if self.notifications else [], self.message_signature
+        )
+        self.renderer.add_layer(
+            'pause', timed('draw_pause_menu', self.draw_pause_menu),
+            lambda: [screen_rect] if self.paused else [], self.pause_menu_signature
+        )
+        # L'overlay de profilage change à chaque frame tant qu'il est affiché
+        self.profiler_rect = pygame.Rect(self.upgrade_region.x - 330, 10, 320, 170)
+        self.renderer.add_layer(
+            'profiler', self.draw_profiler,
+            lambda: [self.profiler_rect] if self.show_profiler else [], lambda: self.profiler.index
+        )
+
+    def upgrade_panel_signature(self):
+        # Seules les lignes visibles comptent : le coût ne dépend pas du nombre d'améliorations
+        signature = [self.buy_mode, self.upgrade_list.scroll]
+        for upgrade in self.upgrade_list.visible():
+            signature.append(self.upgrade_row_state(upgrade))
+        return signature
+
+    def upgrade_row_state(self, upgrade):
+        quantity, total = self.sim.purchase_quote(upgrade, self.buy_mode)
+        return quantity, total, upgrade.count, self.sim.money >= total, upgrade is self.advisor.best()
+
+    def stats_signature(self):
+        return (
+            int(self.sim.money),
+            f"{self.sim.passive_income:.1f}",
+            f"{self.sim.score_multiplier:.1f}",
+            self.sim.current_position,
+            self.sim.stats['total_clicks'],
+            int(self.sim.stats['total_money_earned']),
+            self.sim.stats['total_upgrades_bought']
+        )
+
+    def particles_bounds(self):
+        if self.paused or not self.particles:
+            return []
+        return [self.particles.bounds()]
+
+    def message_signature(self):
+        msg = self.displayed_message()
+        if msg is None:
+            return None
+        return id(msg), self.message_alpha(msg)
+
+    def pause_menu_signature(self):
+        if not self.paused:
+            return None
+        mouse_pos = pygame.mouse.get_pos()
+        hovered = None
+        for i in range(len(self.pause_menu_options)):
+            option_rect = pygame.Rect(self.width // 2 - 100, self.height // 2 + i * 50 - 25, 200, 50)
+            if option_rect.collidepoint(mouse_pos):
+                hovered = i
+        return self.selected_option, hovered, tuple(self.pause_menu_options)
 
     def add_message(self, title, description, duration=5000, priority='normal'):
         current_time = pygame.time.get_ticks()
@@ -278,241 +400,156 @@ class BusinessClicker:
             duration = 10000
         elif priority == 'random':
             duration = 2000
-            for msg in self.messages_queue:
-                if msg['priority'] == 'random' and \
-                current_time - msg['creation_time'] < msg['duration']:
-                    return
         elif priority == "achievement":
             duration = 10000
 
-        for msg in self.messages_queue:
-            if msg['title'] == title and msg['description'] == description:
+        # Doublons, limite de taille et priorités : voir NotificationQueue
+        if self.notifications.push(title, description, priority, current_time, duration) is not None:
+            self.schedule_message_expiry()
+
+    def schedule_message_expiry(self):
+        # Un seul timer, sur la fin du prochain message de la file
+        when = self.notifications.next_expiry()
+        if self.message_timer and not self.message_timer.cancelled:
+            if self.message_timer.when == when:
                 return
-                
-        new_message = {
-            'title': title,
-            'description': description,
-            'creation_time': current_time,
-            'duration': duration,
-            'priority': priority
-        }
-        
-        if priority == 'story':
-            self.messages_queue.append(new_message)
-        elif priority == 'random':
-            self.messages_queue = [msg for msg in self.messages_queue 
-                                if msg['priority'] != 'random']
-            self.messages_queue.append(new_message)
-            
-        if len(self.messages_queue) > 5:
-            story_messages = [msg for msg in self.messages_queue 
-                            if msg['priority'] == 'story']
-            other_messages = [msg for msg in self.messages_queue 
-                            if msg['priority'] != 'story']
-            
-            while len(story_messages) + len(other_messages) > 5:
-                if other_messages:
-                    other_messages.pop(0)
-                elif story_messages:
-                    story_messages.pop(0)
-                    
-            self.messages_queue = story_messages + other_messages
-
-    def update_messages(self):
-        current_time = pygame.time.get_ticks()
-        self.messages_queue = [msg for msg in self.messages_queue 
-                            if current_time - msg['creation_time'] < msg['duration']][:5] # Ne garder que les 5 derniers messages, en supprimant ceux qui sont trop vieux
-
-    def check_story_events(self):
-        for event in self.story_events:
-            if not event.triggered:
-                if event.event_type == 'money' and self.money >= event.trigger_value:
-                    event.triggered = True
-                    self.add_message(event.title, event.description, priority='story')
-                elif event.event_type == 'clicks' and self.stats['total_clicks'] >= event.trigger_value:
-                    event.triggered = True
-                    self.add_message(event.title, event.description, priority='story')
-                elif event.event_type == 'upgrades' and self.stats['total_upgrades_bought'] >= event.trigger_value:
-                    event.triggered = True
-                    self.add_message(event.title, event.description, priority='story')
-
-    def check_achievements(self):
-        for achievement in self.achievements:
-            if not achievement.unlocked:
-                if achievement.condition_type == "clicks" and self.stats['total_clicks'] >= achievement.condition_value:
-                    self.unlock_achievement(achievement)
-                elif achievement.condition_type == "upgrades" and self.stats['total_upgrades_bought'] >= achievement.condition_value:
-                    self.unlock_achievement(achievement)
-                elif achievement.condition_type == "money_earned" and self.stats['total_money_earned'] >= achievement.condition_value:
-                    self.unlock_achievement(achievement)
-
-    def unlock_achievement(self, achievement):
-        achievement.unlocked = True
-        self.money += achievement.reward
-        self.add_message(
-            f"Achievement débloqué : {achievement.title}",
-            f"{achievement.description}\nRécompense : {achievement.reward}€",
-            priority='achievement'
-        )
+            self.message_timer.cancel()
+        self.message_timer = self.timers.schedule(when, self.expire_messages, when) if when is not None else None
+
+    def expire_messages(self, now):
+        self.notifications.expire(now)
+        self.schedule_message_expiry()
+
+    def displayed_message(self):
+        # La mise en page n'est faite que pour le message affiché, pas pour toute une rafale
+        msg = self.notifications.current()
+        if msg is not None and 'surface' not in msg:
+            self.layout_message(msg)
+        return msg
 
     def create_particles(self, pos, count=5):
         current_time = pygame.time.get_ticks()
-        gain_text = f"+{self.click_value * self.score_multiplier:.1f}€" # 1f = 1 chiffre après la virgule
-        
-        new_particles = []
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(2, 5)
-            vel = [math.cos(angle) * speed, math.sin(angle) * speed]
-            lifetime = random.randint(20, 40)
-            
-            new_particles.append({
-                'pos': list(pos),
-                'vel': vel,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime,
-                'text': gain_text
-            })
+        gain_text = f"+{self.sim.click_income * self.sim.score_multiplier:.1f}€" # 1f = 1 chiffre après la virgule
         
-        self.particles.extend(new_particles)
+        self.particles.spawn(pos, count, gain_text)
 
 
     def update_particles(self):
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['lifetime'] -= 1
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-
-    def handle_click(self, pos):
+        self.particles.update()
+
+    def handle_click(self, pos, timestamp=None):
         if self.document_rect.collidepoint(pos):
-            current_time = pygame.time.get_ticks()
-            if current_time - self.last_click_time < self.combo_timeout:
-                self.combo_counter += 1
-                self.score_multiplier = min(2.0, 1 + (self.combo_counter * 0.1))
-            else:
-                self.combo_counter = 0
-                self.score_multiplier = 1.0
-                
-            self.last_click_time = current_time
-            
-            gain = self.click_value * self.score_multiplier
-            self.money += gain
-            self.stats['total_clicks'] += 1
-            self.stats['total_money_earned'] += gain
-            
-            self.click_animation = True
-            self.animation_frame = 0
-            self.create_particles(pos)
-            
-            channel = mixer.find_channel(True)
-            if channel:
-                channel.play(self.click_sound, maxtime=500)
-            
-            if random.random() < 0.05:
-                self.add_message("", random.choice(self.click_messages), priority='random')
-        
-        for button, upgrade in self.upgrade_buttons:
-            if button.collidepoint(pos):
-                self.try_purchase_upgrade(upgrade)
-
-    def try_purchase_upgrade(self, upgrade):
-        # Vérifier si l'utilisateur a assez d'argent
-        if self.money >= upgrade.cost:
-            self.money -= upgrade.cost
-            upgrade.count += 1
-            self.passive_income += upgrade.productivity_boost
-            self.stats['total_upgrades_bought'] += 1
-            
-            upgrade.cost = int(upgrade.cost * 1.15)
+            # Regroupé avec les autres clics de la frame, appliqués par process_clicks
+            if timestamp is None:
+                timestamp = pygame.time.get_ticks()
+            self.pending_clicks.append((timestamp, pos))
+            return
+        
+        # Un achat dépend de l'argent gagné par les clics qui le précèdent
+        self.process_clicks()
+        
+        for mode_rect, quantity in self.buy_mode_buttons:
+            if mode_rect.collidepoint(pos):
+                self.buy_mode = quantity
+        
+        upgrade = self.upgrade_list.upgrade_at(pos)
+        if upgrade is not None:
+            self.sim.try_purchase_upgrade(upgrade, self.buy_mode)
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        time_diff = (current_time - self.last_passive_update) / 1000.0
+    def process_clicks(self):
+        """Applique en une fois les clics sur le document reçus depuis le dernier appel."""
+        if not self.pending_clicks:
+            return
+        clicks, self.pending_clicks = self.pending_clicks, []
+        self.sim.click_batch([timestamp for timestamp, _ in clicks])
+        
+        self.start_click_animation()
+        
+        # Particules pour quelques clics répartis sur la rafale, pas pour chacun
+        shown = max(1, CLICK_PARTICLES_PER_FRAME // 5)
+        for _, pos in clicks[::math.ceil(len(clicks) / shown)]:
+            self.create_particles(pos)
         
-        if time_diff > 0:  # Éviter les calculs inutiles
-            earned = self.passive_income * time_diff
-            self.money += earned
-            self.stats['total_money_earned'] += earned
-            self.last_passive_update = current_time
+        # Un seul son par frame, quel que soit le nombre de clics
+        self.sounds.play('click')
         
-        if self.click_animation:
-            self.update_animation()
+        # Même chance qu'un tirage à 5 % par clic d'avoir au moins un message
+        if self.sim.rng.random() < 1 - 0.95 ** len(clicks):
+            self.add_message("", self.sim.rng.choice(self.click_messages), priority='random')
+
+    def update(self):
+        # Un pas de simulation de SIM_STEP_MS ; le revenu passif, lui, suit l'horloge
+        self.process_clicks()
+        self.sim.update()
+        self.timers.run(pygame.time.get_ticks())  # Fin des messages et de l'animation
         
         if self.particles:
             self.update_particles()
-            
-        self.check_story_events()
-        self.check_promotion()
-        self.check_achievements()
-        self.update_messages()
-
-
-    def update_animation(self):
-        if self.click_animation:
-            self.animation_frame += 1
-            if self.animation_frame >= self.animation_max_frame:
-                self.click_animation = False
-                self.animation_frame = 0
-                return
 
-            if self.animation_frame < self.animation_max_frame / 2:
-                scale = 0.9
-            else:
-                scale = 1.0
-                
-            original_size = self.document.get_rect().size
-            scaled_size = (int(original_size[0] * scale), int(original_size[1] * scale))
-            scaled_doc = pygame.transform.scale(self.document, scaled_size)
-            
-            old_center = self.document_rect.center
-            self.document_rect = scaled_doc.get_rect(center=old_center)
 
-    def draw_messages(self):
-        if not self.messages_queue:
-            return
+    def start_click_animation(self):
+        if self.animation_timer:
+            self.animation_timer.cancel()  # Un nouveau clic relance l'animation
+        self.click_animation = True
+        self.scale_document(0.9)
+        self.animation_timer = self.timers.schedule(
+            pygame.time.get_ticks() + CLICK_ANIMATION_MS // 2, self.release_document)
+
+    def release_document(self):
+        self.scale_document(1.0)
+        self.animation_timer = self.timers.schedule(
+            self.animation_timer.when + CLICK_ANIMATION_MS // 2, self.end_click_animation)
 
-        msg = self.messages_queue[-1] # Dernier message
+    def end_click_animation(self):
+        self.click_animation = False
+        self.animation_timer = None
+
+    def scale_document(self, scale):
+        original_size = self.document.get_rect().size
+        scaled_size = (int(original_size[0] * scale), int(original_size[1] * scale))
+        old_center = self.document_rect.center
+        self.document_rect = pygame.Rect((0, 0), scaled_size)
+        self.document_rect.center = old_center
+
+    def wrap_text(self, text, font, max_width):
+        # Mesure avec font.size (pas de rendu) et un cache de largeur par mot
+        words = text.split(' ')
+        lines = []
+        current_line = []
+        current_width = 0
+        
+        for word in words:
+            key = (font, word)
+            word_width = self.word_widths.get(key)
+            if word_width is None:
+                word_width = self.word_widths[key] = font.size(word + ' ')[0]
+            
+            if current_width + word_width <= max_width:
+                current_line.append(word)
+                current_width += word_width
+            else:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                current_width = word_width
+        
+        if current_line:
+            lines.append(' '.join(current_line))
+        
+        return lines
+
+    def layout_message(self, msg):
+        # Mise en page faite une seule fois, quand le message arrive dans la file
         margin = 20
         padding = 10
         max_width = 800
         
-        def wrap_text(text, font, max_width):
-            words = text.split(' ')
-            lines = []
-            current_line = []
-            current_width = 0
-            
-            for word in words:
-                word_surface = font.render(word + ' ', True, (0, 0, 0))
-                word_width = word_surface.get_width()
-                
-                if current_width + word_width <= max_width:
-                    current_line.append(word)
-                    current_width += word_width
-                else:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                    current_width = word_width
-            
-            if current_line:
-                lines.append(' '.join(current_line))
-            
-            return lines
-        
         title_height = self.font_medium.get_linesize() if msg['title'] else 0
-        desc_lines = wrap_text(msg['description'], self.font_small, max_width - 2 * padding)
+        desc_lines = self.wrap_text(msg['description'], self.font_small, max_width - 2 * padding)
         desc_height = len(desc_lines) * self.font_small.get_linesize()
         
         total_height = padding * 2 + title_height + desc_height
         msg_surface = pygame.Surface((max_width, total_height))
         msg_surface.fill((240, 240, 240))
-        msg_rect = msg_surface.get_rect(midbottom=(self.width // 2, self.height - margin))
-        
-        elapsed = pygame.time.get_ticks() - msg['creation_time']
-        alpha = max(0, min(255, int(255 * (1 - elapsed / msg['duration']))))
-        msg_surface.set_alpha(alpha)
         
         if msg['priority'] == 'story':
             border_color = (100, 150, 255)
@@ -537,66 +574,97 @@ class BusinessClicker:
             current_y += self.font_small.get_linesize()
         
         pygame.draw.rect(msg_surface, border_color, msg_surface.get_rect(), 2)
-        self.screen.blit(msg_surface, msg_rect)
+        msg['surface'] = msg_surface
+        msg['rect'] = msg_surface.get_rect(midbottom=(self.width // 2, self.height - margin))
+
+    def message_alpha(self, msg):
+        elapsed = pygame.time.get_ticks() - msg['creation_time']
+        return max(0, min(255, int(255 * (1 - elapsed / msg['duration']))))
+
+    def draw_messages(self):
+        msg = self.displayed_message()
+        if msg is None:
+            return
+
+        # Seul le fondu change d'une frame à l'autre
+        msg['surface'].set_alpha(self.message_alpha(msg))
+        self.screen.blit(msg['surface'], msg['rect'])
 
     def draw_upgrade_panel(self):
         pygame.draw.rect(self.screen, (240, 240, 240), self.upgrade_region)
-        self.screen.blit(self.font_medium.render("Améliorations", True, (0, 0, 0)), 
+        self.screen.blit(self.text_cache.render(self.font_medium, "Améliorations", (0, 0, 0)), 
                         (self.upgrade_region.x + 10, 50))
         
-        for button, upgrade in self.upgrade_buttons:
-            color = (200, 200, 200) if self.money >= upgrade.cost else (150, 150, 150)
-            pygame.draw.rect(self.screen, color, button, border_radius=5)
-            
-            self.screen.blit(self.upgrade_icons[upgrade.name], 
-                            self.upgrade_icons[upgrade.name].get_rect(midleft=(button.x + 10, button.centery)))
-            
-            # Utilisation de f-strings pour de meilleures performances
-            self.screen.blit(self.font_medium.render(upgrade.name, True, (0, 0, 0)), 
-                            (button.x + 50, button.y + 10))
-            self.screen.blit(self.font_small.render(f"Coût : {upgrade.cost}€", True, (0, 0, 0)), 
-                            (button.x + 50, button.y + 35))
-            self.screen.blit(self.font_small.render(f"+{upgrade.productivity_boost:.1f}€/s", True, (0, 100, 0)), 
-                            (button.x + 50, button.y + 55))
-            self.screen.blit(self.font_small.render(f"Niveau : {upgrade.count}", True, (0, 0, 0)), 
-                            (button.right - 100, button.centery))
+        for mode_rect, quantity in self.buy_mode_buttons:
+            color = (100, 150, 255) if quantity == self.buy_mode else (200, 200, 200)
+            pygame.draw.rect(self.screen, color, mode_rect, border_radius=5)
+            label = self.text_cache.render(self.font_small, "Max" if quantity == BUY_MAX else f"x{quantity}", (0, 0, 0))
+            self.screen.blit(label, label.get_rect(center=mode_rect.center))
+        
+        self.upgrade_list.draw(self.screen, self.upgrade_row_state, self.render_upgrade_row)
+
+    def render_upgrade_row(self, upgrade, state):
+        # Surface d'une ligne, gardée par la liste tant que son état ne change pas
+        quantity, total, count, affordable, best = state
+        row = pygame.Surface(self.upgrade_list.row_size, pygame.SRCALPHA)
+        button = row.get_rect()
+        color = (200, 200, 200) if affordable else (150, 150, 150)
+        pygame.draw.rect(row, color, button, border_radius=5)
+        if best:
+            # Meilleur temps de retour (coût / gain) : le conseil de l'Advisor
+            pygame.draw.rect(row, (255, 190, 0), button, 3, border_radius=5)
+        
+        row.blit(self.upgrade_icons[upgrade.name], 
+                 self.upgrade_icons[upgrade.name].get_rect(midleft=(button.x + 10, button.centery)))
+        
+        # Utilisation de f-strings pour de meilleures performances
+        row.blit(self.text_cache.render(self.font_medium, upgrade.name, (0, 0, 0)), 
+                 (button.x + 50, button.y + 10))
+        cost_label = f"Coût : {total}€" if quantity == 1 else f"Coût x{quantity} : {total}€"
+        row.blit(self.text_cache.render(self.font_small, cost_label, (0, 0, 0)), 
+                 (button.x + 50, button.y + 35))
+        row.blit(self.text_cache.render(self.font_small, f"+{upgrade.productivity_boost:.1f}€/s", (0, 100, 0)), 
+                 (button.x + 50, button.y + 55))
+        row.blit(self.text_cache.render(self.font_small, f"Niveau : {count}", (0, 0, 0)), 
+                 (button.right - 100, button.centery))
+        return row
 
 
     def draw_stats(self):
         pygame.draw.rect(self.screen, (240, 240, 240), self.stats_region)
         
-        money_text = self.font_large.render(f"{int(self.money)}€", True, (0, 0, 0))
+        money_text = self.text_cache.render(self.font_large, f"{int(self.sim.money)}€", (0, 0, 0))
         self.screen.blit(money_text, (20, 20))
         
-        income_text = self.font_medium.render(f"{self.passive_income:.1f}€/s", True, (0, 100, 0))
+        income_text = self.text_cache.render(self.font_medium, f"{self.sim.passive_income:.1f}€/s", (0, 100, 0))
         self.screen.blit(income_text, (20, 70))
 
-        if self.score_multiplier > 1.0:
+        if self.sim.score_multiplier > 1.0:
             combo_color = (255, 165, 0)
-            if self.score_multiplier >= 1.5:
+            if self.sim.score_multiplier >= 1.5:
                 combo_color = (255, 69, 0)  # Orange plus foncé pour les gros combos
                 
-            multiplier_text = self.font_medium.render(
-                f"Combo x{self.score_multiplier:.1f}",
-                True,
+            multiplier_text = self.text_cache.render(
+                self.font_medium,
+                f"Combo x{self.sim.score_multiplier:.1f}",
                 combo_color
             )
             self.screen.blit(multiplier_text, (20, 120))
 
-        position_text = self.font_medium.render(f"Poste : {self.current_position}", True, (0, 0, 0))
+        position_text = self.text_cache.render(self.font_medium, f"Poste : {self.sim.current_position}", (0, 0, 0))
         self.screen.blit(position_text, (20, 160))
 
         # Statistiques en bas de l'écran
         stats_y = self.height - 100
-        clicks_text = self.font_small.render(f"Clics totaux : {self.stats['total_clicks']}", True, (0, 0, 0))
-        money_earned_text = self.font_small.render(
-            f"Argent total gagné : {int(self.stats['total_money_earned'])}€",
-            True,
+        clicks_text = self.text_cache.render(self.font_small, f"Clics totaux : {self.sim.stats['total_clicks']}", (0, 0, 0))
+        money_earned_text = self.text_cache.render(
+            self.font_small,
+            f"Argent total gagné : {int(self.sim.stats['total_money_earned'])}€",
             (0, 0, 0)
         )
-        upgrades_text = self.font_small.render(
-            f"Améliorations achetées : {self.stats['total_upgrades_bought']}",
-            True,
+        upgrades_text = self.text_cache.render(
+            self.font_small,
+            f"Améliorations achetées : {self.sim.stats['total_upgrades_bought']}",
             (0, 0, 0)
         )
         
@@ -605,128 +673,258 @@ class BusinessClicker:
         self.screen.blit(upgrades_text, (20, stats_y + 50))
 
     def draw_particles(self):
-        for particle in self.particles:
-            alpha = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-            text_color = (0, 200, 0) if self.score_multiplier == 1.0 else (255, 165, 0)
-            text = self.font_small.render(particle['text'], True, text_color)
-            text.set_alpha(alpha)
-            self.screen.blit(text, particle['pos'])
+        text_color = (0, 200, 0) if self.sim.score_multiplier == 1.0 else (255, 165, 0)
+        # Une surface partagée par gain et par palier d'alpha, blittées en un seul appel
+        self.particles.draw(
+            self.screen,
+            lambda text, alpha: self.text_cache.render(self.font_small, text, text_color, alpha),
+            self.interpolation
+        )
 
-    def draw(self):
-        self.screen.blit(self.background, (0, 0))
+    def draw_document(self):
         self.screen.blit(self.document, self.document_rect)
-        self.draw_upgrade_panel()
-        self.draw_stats()
-        self.draw_particles()
-        self.draw_messages()
-        pygame.display.flip()
 
-    def save_game(self):
-        save_data = {
-            'money': self.money,
-            'click_value': self.click_value,
-            'passive_income': self.passive_income,
-            'stats': self.stats,
-            'upgrades': [(u.name, u.count, u.cost) for u in self.upgrades],
-            'current_position': self.current_position,
-            'triggered_events': [event.triggered for event in self.story_events],
-            'achievements': [(a.title, a.unlocked) for a in self.achievements],
+    def draw_profiler(self):
+        box = pygame.Surface(self.profiler_rect.size, pygame.SRCALPHA)
+        box.fill((0, 0, 0, 190))
+        self.screen.blit(box, self.profiler_rect)
+
+        # Temps de travail par frame (sans l'attente de clock.tick), 2 px par frame
+        frames = self.profiler.recent(150)
+        work_times = [(total - durations.get('tick', 0)) / 1e6 for _, total, durations, _, _ in frames]
+        graph = pygame.Rect(self.profiler_rect.x + 10, self.profiler_rect.y + 10, 300, 80)
+        scale = graph.height / 33.3  # Échelle fixe : 0 à 2 frames à 60 FPS
+        for i, ms in enumerate(work_times):
+            height = min(graph.height, max(1, int(ms * scale)))
+            color = (0, 200, 0) if ms < 16.7 else (255, 80, 80)
+            pygame.draw.line(self.screen, color, (graph.x + i * 2, graph.bottom), (graph.x + i * 2, graph.bottom - height))
+        budget_y = graph.bottom - int(16.7 * scale)
+        pygame.draw.line(self.screen, (255, 255, 0), (graph.x, budget_y), (graph.right, budget_y))
+
+        counters = frames[-1][4] if frames else {}
+        lines = [
+            f"Frame : {work_times[-1] if work_times else 0:.2f} ms (max {max(work_times, default=0):.2f} ms)",
+            f"Particules : {counters.get('particles', 0)}   Messages : {counters.get('messages', 0)}",
+            f"Rendus de texte : {counters.get('text_renders', 0)} / frame",
+        ]
+        # Rendu direct, pas via le cache : ces textes changent à chaque frame
+        for i, line in enumerate(lines):
+            text = self.font_small.render(line, True, (255, 255, 255))
+            self.screen.blit(text, (graph.x, graph.bottom + 8 + i * 22))
+
+    def export_profile(self):
+        # Les PROFILER_FRAMES dernières frames, lisibles dans un tableur ou chrome://tracing
+        base = time.strftime("profile-%Y%m%d-%H%M%S")
+        try:
+            self.profiler.export_csv(base + '.csv')
+            self.profiler.export_chrome_trace(base + '.json')
+        except OSError as e:
+            print(f"Erreur lors de l'export du profil : {e}")
+            return
+        self.add_message("Profil exporté", f"{base}.csv et {base}.json", 3000, 'story')
+
+    def draw(self):
+        # Seules les zones qui ont changé depuis la frame précédente sont redessinées
+        rects = self.renderer.render()
+        with self.profiler.stage('display'):
+            self.renderer.present(rects)
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close()  # Écrit le résultat final, comparé au rejeu
+            self.recorder = None
+
+    def save_data(self):
+        # Instantané de l'état : des copies, pour pouvoir être sérialisé sur un autre thread
+        save_data = self.sim.to_save_data()
+        save_data.update({
             'music_enabled': self.music_enabled,
             'sound_enabled': self.sound_enabled,
             'music_volume': self.music_volume,
             'sound_volume': self.sound_volume
-        }
+        })
+        return save_data
+
+    def write_save(self, save_data):
         try:
-            with open('sauvegarde.json', 'w') as f:
-                json.dump(save_data, f)
-        except:
-            print("Erreur lors de la sauvegarde")
+            if SAVE_FORMAT == 'binary':
+                write_atomic(BINARY_SAVE_FILE, save_format.encode(save_data))
+            else:
+                write_atomic(SAVE_FILE, json.dumps(save_data).encode('utf-8'))
+        except (OSError, ValueError) as e:  # ValueError : état impossible à encoder
+            print(f"Erreur lors de la sauvegarde : {e}")
+
+    def save_game(self):
+        self.write_save(self.save_data())
+
+    def find_save(self):
+        # Le format configuré d'abord, l'autre ensuite : une sauvegarde JSON existante
+        # est relue puis réécrite en binaire à la prochaine sauvegarde (et inversement)
+        paths = [BINARY_SAVE_FILE, SAVE_FILE] if SAVE_FORMAT == 'binary' else [SAVE_FILE, BINARY_SAVE_FILE]
+        for path in paths:
+            if os.path.exists(path):
+                return path
+        return None
+
+    def read_save(self, path):
+        if path == BINARY_SAVE_FILE:
+            with open(path, 'rb') as f:
+                return save_format.decode(f.read())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
     def load_game(self):
+        path = self.find_save()
+        if path is None:
+            return  # Pas de sauvegarde existante
         try:
-            with open('sauvegarde.json', 'r') as f:
-                data = json.load(f)
-                self.money = data['money']
-                self.click_value = data['click_value']
-                self.passive_income = data['passive_income']
-                self.stats = data['stats']
-                self.current_position = data.get('current_position', "Stagiaire")
-
-                # Charger les événements déclenchés
-                for event, triggered in zip(self.story_events, data.get('triggered_events', [])):
-                    event.triggered = triggered
-
-                # Charger les améliorations
-                for (name, count, cost), upgrade in zip(data['upgrades'], self.upgrades):
-                    upgrade.count = count
-                    upgrade.cost = cost
-
-                # Charger les achievements
-                for (title, unlocked), achievement in zip(data.get('achievements', []), self.achievements):
-                    achievement.unlocked = unlocked
-                
-                self.music_enabled = data.get('music_enabled', True)
-                self.sound_enabled = data.get('sound_enabled', True)
-                self.music_volume = data.get('music_volume', 0.5)
-                self.sound_volume = data.get('sound_volume', 0.2)
-                
-                # Appliquer les préférences audio
-                if not self.music_enabled:
-                    pygame.mixer.music.stop()
-                if not self.sound_enabled:
-                    self.click_sound.set_volume(0)
-                else:
-                    self.click_sound.set_volume(self.sound_volume)
-                pygame.mixer.music.set_volume(self.music_volume)
+            data = self.read_save(path)
+        except save_format.UnknownVersionError as e:
+            # Écrite par une version plus récente : la prochaine sauvegarde l'écraserait
+            sys.exit(f"{e} ({path}) : mettez le jeu à jour, la sauvegarde n'a pas été modifiée")
+        except (ValueError, struct.error):
+            # Mise de côté plutôt qu'écrasée par la prochaine sauvegarde
+            corrupt = path + '.corrupt'
+            os.replace(path, corrupt)
+            print(f"Sauvegarde illisible, déplacée dans {corrupt} : nouvelle partie")
+            return
+
+        self.sim.load_save_data(data)
+        self.advisor.rebuild()
+        
+        self.music_enabled = data.get('music_enabled', True)
+        self.sound_enabled = data.get('sound_enabled', True)
+        self.music_volume = data.get('music_volume', 0.5)
+        self.sound_volume = data.get('sound_volume', 0.2)
+        
+        # Appliquer les préférences audio
+        if not self.music_enabled:
+            pygame.mixer.music.stop()
+        self.sounds.set_volume(self.sound_volume)
+        self.sounds.set_muted(not self.sound_enabled)
+        pygame.mixer.music.set_volume(self.music_volume)
 
-        except FileNotFoundError:
-            pass  # Pas de sauvegarde existante
+    def step_simulation(self, accumulator):
+        """Fait autant de pas fixes que le temps accumulé le permet, renvoie le reste."""
+        steps = 0
+        while accumulator >= SIM_STEP_MS and steps < MAX_SIM_STEPS:
+            self.update()
+            accumulator -= SIM_STEP_MS
+            steps += 1
+        if steps == MAX_SIM_STEPS:
+            accumulator = 0  # Trop de retard (machine très lente, fenêtre gelée) : on repart d'ici
+        self.interpolation = accumulator / SIM_STEP_MS
+        return accumulator
+
+    def frame_rate(self):
+        """Images par seconde visées pour la prochaine frame."""
+        if not self.window_active or not pygame.display.get_active():
+            return BACKGROUND_FPS  # Fenêtre réduite ou en arrière-plan
+        if (self.particles or self.click_animation or self.notifications or self.show_profiler
+                or pygame.time.get_ticks() - self.last_input_time < ACTIVE_GRACE_MS):
+            return RENDER_FPS
+        return IDLE_FPS  # Rien n'est animé : seuls l'argent et les stats changent
+
+    def wait_next_frame(self, clock):
+        """Attend la prochaine frame ; renvoie l'événement qui a interrompu l'attente, s'il y en a un."""
+        fps = self.frame_rate()
+        if fps == RENDER_FPS:
+            clock.tick(RENDER_FPS)
+            return None
+        # Au ralenti, on dort jusqu'au prochain événement : une entrée relance
+        # aussitôt la pleine cadence au lieu d'attendre la fin de la frame
+        event = pygame.event.wait(1000 // fps)
+        clock.tick()
+        return event if event.type != pygame.NOEVENT else None
 
     def run(self):
         clock = pygame.time.Clock()
         running = True
+        accumulator = 0.0  # Temps (ms) pas encore simulé
+        last_time = time.perf_counter()
+        waited_event = None
         
         while running:
+            self.profiler.begin_frame()
+            
             # Gestion des événements
-            for event in pygame.event.get():
+            self.profiler.start('events')
+            events = pygame.event.get()
+            if waited_event:
+                events.insert(0, waited_event)
+            for event in events:
+                if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.MOUSEWHEEL):
+                    self.last_input_time = pygame.time.get_ticks()
+                
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.paused = not self.paused  # Toggle pause state
+                    elif event.key == pygame.K_F3:
+                        self.show_profiler = not self.show_profiler
+                    elif event.key == pygame.K_F4:
+                        self.export_profile()
+                    elif event.key == pygame.K_F5:
+                        self.reload_content()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if not self.paused and event.button == 1:
-                        self.handle_click(event.pos)
+                        self.handle_click(event.pos, getattr(event, 'timestamp', None))
+                elif event.type == pygame.MOUSEWHEEL:
+                    if not self.paused and self.upgrade_region.collidepoint(pygame.mouse.get_pos()):
+                        self.upgrade_list.on_wheel(event.y)
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.renderer.invalidate()  # La fenêtre a été recouverte puis réaffichée
+                elif event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+                    self.window_active = False
+                elif event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED):
+                    self.window_active = True
+                    self.renderer.invalidate()
                 
                 # Gérer les entrées du menu pause si le jeu est en pause
                 if self.paused:
                     self.handle_pause_input(event)
+            self.process_clicks()
+            self.profiler.stop('events')
             
-            # Clear the screen once
-            self.screen.blit(self.background, (0, 0))
-            
-            # Mise à jour du jeu si pas en pause
-            if not self.paused:
-                self.update()
-                self.screen.blit(self.document, self.document_rect)
-                self.draw_upgrade_panel()
-                self.draw_stats()
-                self.draw_particles()
-                self.draw_messages()
+            # Mise à jour du jeu si pas en pause, à pas fixe : la vitesse du jeu ne
+            # dépend pas du nombre d'images par seconde
+            now = time.perf_counter()
+            if self.paused:
+                accumulator = 0.0
             else:
-                # When paused, draw the game state without updates
-                self.screen.blit(self.document, self.document_rect)
-                self.draw_upgrade_panel()
-                self.draw_stats()
-                self.draw_messages()
-                # Draw pause menu on top
-                self.draw_pause_menu()
+                with self.profiler.stage('update'):
+                    accumulator = self.step_simulation(accumulator + (now - last_time) * 1000)
+            last_time = now
             
-            # Single display update per frame
-            pygame.display.flip()
-            clock.tick(60)
+            # Le menu pause est une couche du renderer, dessinée par-dessus le reste
+            self.draw()
+            
+            # Sauvegarde périodique : sérialisation et écriture hors du thread du jeu
+            with self.profiler.stage('autosave'):
+                self.autosave.maybe_save(time.monotonic(), self.save_data)
+            
+            # Rechargement à chaud : on ne relit le contenu que si un fichier a changé
+            if CONTENT_POLL_INTERVAL and not self.recorder and time.monotonic() - self.last_content_check >= CONTENT_POLL_INTERVAL:
+                self.last_content_check = time.monotonic()
+                mtimes = content_mtimes()
+                if mtimes != self.content_mtimes:
+                    self.content_mtimes = mtimes
+                    self.reload_content()
+            # Le revenu passif suit l'horloge : il est crédité quelle que soit la cadence
+            with self.profiler.stage('tick'):
+                waited_event = self.wait_next_frame(clock)
+            
+            self.profiler.end_frame({
+                'particles': len(self.particles),
+                'messages': len(self.notifications),
+                'text_renders': self.text_cache.renders - self.last_text_renders
+            })
+            self.last_text_renders = self.text_cache.renders
         
         # Sauvegarde et sortie
+        self.autosave.stop()
+        self.stop_recording()
         self.save_game()
         pygame.quit()
-        sys.exit()
\ No newline at end of file
+        sys.exit()
\ No newline at end of file
@@ -1,13 +1,3 @@
-PROMOTION_LEVELS = {
-    "Stagiaire": 0,
-    "Assistant": 200,
-    "Chargé de Mission": 500,
-    "Chef de Projet": 2000,
-    "Directeur Adjoint": 5000,
-    "Directeur": 10000,
-    "PDG": 50000
-}
-
 CLICK_MESSAGES = [
     "Encore un dossier de traité !",
     "La machine est bien huilée",
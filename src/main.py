@@ -1,7 +1,12 @@
+import argparse
 from game import BusinessClicker
 
 def main():
-    game = BusinessClicker()
+    parser = argparse.ArgumentParser(description="Business Clicker")
+    parser.add_argument('--record', metavar='FICHIER', help="enregistre la partie, à rejouer avec replay.py")
+    args = parser.parse_args()
+    
+    game = BusinessClicker(record_path=args.record)
     game.run()
 
 if __name__ == "__main__":
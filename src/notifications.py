@@ -0,0 +1,90 @@
+import heapq
+import itertools
+from collections import OrderedDict
+
+# Voies, de la plus prioritaire à la moins prioritaire pour l'affichage
+LANES = ('story', 'achievement', 'normal', 'random')
+
+
+class NotificationQueue:
+    """Messages en attente d'affichage, rangés par priorité.
+
+    Chaque priorité a sa voie (messages dans l'ordre d'arrivée) ; on affiche le
+    plus récent de la voie la plus prioritaire. Les doublons (même titre, même
+    texte) sont repérés avec un ensemble, les expirations avec un tas : ajouter,
+    expirer ou évincer un message coûte O(log n), même pour des centaines de
+    messages d'un coup (achievements débloqués au retour d'une absence...).
+
+    Au-delà de `capacity`, le message le plus ancien hors 'story' est évincé, et
+    un 'story' seulement s'il ne reste qu'eux. Un seul message 'random' à la fois :
+    les suivants sont ignorés tant qu'il est affiché.
+    """
+
+    def __init__(self, capacity=5):
+        self.capacity = capacity
+        self.lanes = {lane: OrderedDict() for lane in LANES}  # Ordre -> message
+        self.keys = set()  # (titre, texte) des messages présents
+        self.expiries = []  # Tas de (fin, ordre, voie)
+        self.order = itertools.count()
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, title, description, priority, now, duration):
+        """Ajoute un message ; renvoie None s'il est ignoré (doublon, 'random' déjà affiché)."""
+        key = (title, description)
+        if key in self.keys or (priority == 'random' and self.lanes['random']):
+            return None
+        seq = next(self.order)
+        message = {
+            'title': title,
+            'description': description,
+            'creation_time': now,
+            'duration': duration,
+            'priority': priority,
+            'seq': seq,
+        }
+        self.lanes[priority][seq] = message
+        self.keys.add(key)
+        self.size += 1
+        heapq.heappush(self.expiries, (now + duration, seq, priority))
+        while self.size > self.capacity:
+            self.evict()
+        return message
+
+    def remove(self, message):
+        lane = self.lanes[message['priority']]
+        if lane.pop(message['seq'], None) is not None:
+            self.keys.discard((message['title'], message['description']))
+            self.size -= 1
+
+    def evict(self):
+        heads = [next(iter(self.lanes[lane].values())) for lane in LANES[1:] if self.lanes[lane]]
+        if heads:
+            self.remove(min(heads, key=lambda message: message['seq']))
+        else:
+            self.remove(next(iter(self.lanes['story'].values())))
+
+    def next_expiry(self):
+        """Fin du prochain message encore présent, ou None."""
+        heap = self.expiries
+        while heap and heap[0][1] not in self.lanes[heap[0][2]]:
+            heapq.heappop(heap)  # Message déjà évincé
+        return heap[0][0] if heap else None
+
+    def expire(self, now):
+        """Retire les messages dont la durée est écoulée à `now`."""
+        heap = self.expiries
+        while heap and heap[0][0] <= now:
+            _, seq, priority = heapq.heappop(heap)
+            message = self.lanes[priority].get(seq)
+            if message is not None:
+                self.remove(message)
+
+    def current(self):
+        """Message à afficher : le plus récent de la voie la plus prioritaire."""
+        for lane in LANES:
+            if self.lanes[lane]:
+                return next(reversed(self.lanes[lane].values()))
+        return None
@@ -0,0 +1,119 @@
+import numpy as np
+import pygame
+from constants import PARTICLE_CAPACITY
+
+ALPHA_STEP = 16  # Les particules partagent une surface par palier d'alpha
+ALPHA_LEVELS = 256 // ALPHA_STEP
+
+
+class ParticleSystem:
+    """Particules de gain stockées en "structure de tableaux" NumPy.
+
+    Position, vitesse et durée de vie sont des colonnes de tableaux préalloués :
+    l'intégration se fait en une opération vectorielle (un pas de simulation fixe
+    par appel à `update`), les particules mortes sont
+    remplacées par les dernières vivantes (swap-remove, sans décaler le reste), et le
+    dessin passe par un seul `Surface.blits` avec une surface de texte par valeur de
+    gain et par palier d'alpha. La position du pas précédent est gardée pour que
+    le dessin puisse interpoler entre deux pas.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.count = 0
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.text = np.zeros(capacity, dtype=np.int32)  # text_id de chaque particule
+        self.texts = []  # Texte de chaque text_id
+        self.text_ids = {}  # Texte -> text_id
+        self.rng = np.random.default_rng(seed)
+
+    def grow(self, capacity):
+        for name in ('pos', 'prev_pos', 'vel', 'lifetime', 'max_lifetime', 'text'):
+            old = getattr(self, name)
+            new = np.ones((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, pos, count, text):
+        if self.count + count > self.capacity:
+            self.grow(max(self.capacity * 2, self.count + count))
+        if text not in self.text_ids:
+            self.text_ids[text] = len(self.texts)
+            self.texts.append(text)
+
+        start, end = self.count, self.count + count
+        angles = self.rng.uniform(0, np.pi * 2, count)
+        speeds = self.rng.uniform(2, 5, count)
+        lifetimes = self.rng.integers(20, 41, count)
+
+        self.pos[start:end] = pos
+        self.prev_pos[start:end] = pos
+        self.vel[start:end, 0] = np.cos(angles) * speeds
+        self.vel[start:end, 1] = np.sin(angles) * speeds
+        self.lifetime[start:end] = lifetimes
+        self.max_lifetime[start:end] = lifetimes
+        self.text[start:end] = self.text_ids[text]
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        self.prev_pos[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n]
+        self.lifetime[:n] -= 1
+
+        dead = np.flatnonzero(self.lifetime[:n] <= 0)
+        if len(dead):
+            alive_count = n - len(dead)
+            # Les trous avant alive_count sont comblés par les vivantes situées après
+            holes = dead[dead < alive_count]
+            tail = np.arange(alive_count, n)
+            movers = tail[self.lifetime[alive_count:n] > 0]
+            for array in (self.pos, self.prev_pos, self.vel, self.lifetime, self.max_lifetime, self.text):
+                array[holes] = array[movers]
+            self.count = alive_count
+
+        if self.count == 0:
+            # Plus rien à l'écran : on repart d'une table de textes vide
+            self.texts.clear()
+            self.text_ids.clear()
+
+    def bounds(self, size=(80, 20)):
+        n = self.count
+        if n == 0:
+            return None
+        # Les positions dessinées sont entre prev_pos et pos
+        x_min, y_min = np.minimum(self.pos[:n].min(axis=0), self.prev_pos[:n].min(axis=0))
+        x_max, y_max = np.maximum(self.pos[:n].max(axis=0), self.prev_pos[:n].max(axis=0))
+        return pygame.Rect(int(x_min), int(y_min), int(x_max - x_min) + size[0], int(y_max - y_min) + size[1])
+
+    def draw(self, screen, render_text, interpolation=1.0):
+        """`render_text(texte, alpha)` renvoie la surface partagée à blitter.
+
+        `interpolation` (entre 0 et 1) place chaque particule entre son pas
+        précédent et son pas courant, selon le temps écoulé depuis le dernier pas.
+        """
+        n = self.count
+        if n == 0:
+            return
+        levels = (255 * self.lifetime[:n] // self.max_lifetime[:n]) // ALPHA_STEP
+        # Une surface par (texte, palier d'alpha) présent à l'écran
+        keys = (self.text[:n] * ALPHA_LEVELS + levels).tolist()
+        surfaces = {
+            key: render_text(self.texts[key // ALPHA_LEVELS], (key % ALPHA_LEVELS) * ALPHA_STEP)
+            for key in set(keys)
+        }
+        positions = self.prev_pos[:n] + (self.pos[:n] - self.prev_pos[:n]) * interpolation
+        screen.blits(
+            [(surfaces[key], position) for key, position in zip(keys, positions.tolist())],
+            doreturn=False
+        )
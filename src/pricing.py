@@ -0,0 +1,91 @@
+import math
+from bisect import bisect_right
+from typing import Dict, Tuple
+from constants import UPGRADE_COST_GROWTH
+
+BUY_MAX = 'max'
+
+
+class CostTable:
+    """Suite des coûts d'une amélioration : c, int(c * g), int(int(c * g) * g)...
+
+    La troncature entière à chaque achat empêche une formule fermée exacte, donc on
+    précalcule la suite (et ses sommes cumulées) une fois, à la demande, et on la
+    partage entre toutes les parties. Le prix de N niveaux devient une soustraction,
+    et le nombre de niveaux abordables une recherche dichotomique.
+    """
+
+    def __init__(self, base_cost, growth=UPGRADE_COST_GROWTH):
+        self.growth = growth
+        self.costs = [base_cost]
+        self.prefix = [0, base_cost]  # prefix[i] = somme des i premiers coûts
+        self.stalled = False  # int(c * g) == c : le coût ne bouge plus
+        self.overflow = False  # Le coût suivant dépasse ce qu'un float peut représenter
+
+    def _grow(self):
+        last = self.costs[-1]
+        try:
+            next_cost = int(last * self.growth)
+        except OverflowError:
+            self.overflow = True
+            return False
+        if next_cost == last:
+            self.stalled = True
+            return False
+        self.costs.append(next_cost)
+        self.prefix.append(self.prefix[-1] + next_cost)
+        return True
+
+    def _extend_to(self, index):
+        while len(self.costs) <= index and not (self.stalled or self.overflow):
+            self._grow()
+
+    def cost_at(self, index):
+        self._extend_to(index)
+        if index < len(self.costs):
+            return self.costs[index]
+        return self.costs[-1] if self.stalled else math.inf
+
+    def _sum_to(self, index):
+        # Somme des `index` premiers coûts
+        self._extend_to(index - 1)
+        if index < len(self.prefix):
+            return self.prefix[index]
+        if self.stalled:
+            return self.prefix[-1] + (index - len(self.costs)) * self.costs[-1]
+        return math.inf
+
+    def total(self, start, count):
+        """Prix de `count` niveaux achetés à partir du niveau `start`."""
+        return self._sum_to(start + count) - self._sum_to(start)
+
+    def max_affordable(self, start, budget):
+        """Plus grand nombre de niveaux achetables à partir de `start` avec `budget`."""
+        limit = self._sum_to(start) + budget
+        # On n'étend la table que tant que les sommes restent dans le budget
+        while self.prefix[-1] <= limit and self._grow():
+            pass
+        count = bisect_right(self.prefix, limit) - 1 - start
+        if self.stalled and count == len(self.costs) - start:
+            count += int((limit - self.prefix[-1]) // self.costs[-1])
+        return max(0, count)
+
+
+_tables: Dict[Tuple[int, float], CostTable] = {}
+
+
+def get_cost_table(base_cost, growth=UPGRADE_COST_GROWTH):
+    key = (base_cost, growth)
+    if key not in _tables:
+        _tables[key] = CostTable(base_cost, growth)
+    return _tables[key]
+
+
+def locate(upgrade, growth=UPGRADE_COST_GROWTH):
+    """Renvoie (table, index) tels que table.cost_at(index) == upgrade.cost."""
+    table = get_cost_table(upgrade.base_cost, growth)
+    if table.cost_at(upgrade.count) == upgrade.cost:
+        return table, upgrade.count
+    # Coût qui ne suit pas la suite de base (ancienne sauvegarde...) : on repart de lui
+    return get_cost_table(upgrade.cost, growth), 0
+
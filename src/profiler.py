@@ -0,0 +1,102 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from constants import PROFILER_FRAMES
+
+# Étapes de run() dans l'ordre où elles apparaissent dans une frame
+STAGES = [
+    'events', 'update', 'draw_document', 'draw_upgrade_panel', 'draw_stats',
+    'draw_particles', 'draw_messages', 'draw_pause_menu', 'display', 'autosave', 'tick'
+]
+
+
+class FrameProfiler:
+    """Chronométrage de chaque étape de la frame avec `perf_counter_ns`.
+
+    Les PROFILER_FRAMES dernières frames sont gardées dans un buffer circulaire
+    (début de frame, durée et début de chaque étape, compteurs), toujours actif :
+    l'overlay ne fait que l'afficher, et on peut l'exporter à tout moment en CSV
+    ou au format Chrome trace (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, size=PROFILER_FRAMES):
+        self.size = size
+        self.frames = [None] * size
+        self.index = 0  # Prochaine case à écrire
+        self.count = 0
+        self.frame_start = 0
+        self.durations = {}
+        self.starts = {}
+        self.running = {}
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+        self.durations = {}
+        self.starts = {}
+
+    def start(self, stage):
+        self.running[stage] = time.perf_counter_ns()
+
+    def stop(self, stage):
+        start = self.running.pop(stage)
+        # Une étape appelée plusieurs fois dans la frame (une par zone sale) est cumulée
+        self.durations[stage] = self.durations.get(stage, 0) + time.perf_counter_ns() - start
+        self.starts.setdefault(stage, start)
+
+    @contextmanager
+    def stage(self, stage):
+        self.start(stage)
+        try:
+            yield
+        finally:
+            self.stop(stage)
+
+    def wrap(self, stage, function):
+        def timed(*args, **kwargs):
+            self.start(stage)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.stop(stage)
+        return timed
+
+    def end_frame(self, counters):
+        total = time.perf_counter_ns() - self.frame_start
+        self.frames[self.index] = (self.frame_start, total, self.durations, self.starts, counters)
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def recent(self, n=None):
+        """Les `n` dernières frames, de la plus ancienne à la plus récente."""
+        n = self.count if n is None else min(n, self.count)
+        return [self.frames[(self.index - n + i) % self.size] for i in range(n)]
+
+    def frame_times_ms(self, n=None):
+        return [frame[1] / 1e6 for frame in self.recent(n)]
+
+    def export_csv(self, path):
+        frames = self.recent()
+        counter_names = sorted({name for frame in frames for name in frame[4]})
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame_start_ns', 'frame_ms'] + [f"{stage}_ms" for stage in STAGES] + counter_names)
+            for frame_start, total, durations, _, counters in frames:
+                writer.writerow(
+                    [frame_start, total / 1e6] +
+                    [durations.get(stage, 0) / 1e6 for stage in STAGES] +
+                    [counters.get(name, 0) for name in counter_names]
+                )
+
+    def export_chrome_trace(self, path):
+        events = []
+        for frame_start, total, durations, starts, counters in self.recent():
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': frame_start / 1000, 'dur': total / 1000})
+            for stage, duration in durations.items():
+                events.append({'name': stage, 'ph': 'X', 'pid': 1, 'tid': 1,
+                               'ts': starts[stage] / 1000, 'dur': duration / 1000})
+            events.append({'name': 'compteurs', 'ph': 'C', 'pid': 1, 'tid': 1,
+                           'ts': frame_start / 1000, 'args': counters})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
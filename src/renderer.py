@@ -0,0 +1,84 @@
+import pygame
+
+
+class Layer:
+    def __init__(self, name, draw, bounds, signature=None):
+        self.name = name
+        self.draw = draw  # Dessine la couche sur l'écran
+        self.bounds = bounds  # Liste des Rect occupés par la couche
+        self.signature = signature  # Valeur qui change quand l'apparence change (None = bounds seules)
+        self.last_bounds = []
+        self.last_signature = None
+
+
+class DirtyRenderer:
+    """Rendu "retenu" : seules les zones qui ont changé sont redessinées.
+
+    Chaque couche décrit où elle dessine (bounds) et une signature de son contenu.
+    D'une frame à l'autre, une couche dont la signature ou les bounds changent marque
+    son ancienne et sa nouvelle zone comme sales ; on redessine alors le fond puis
+    toutes les couches qui touchent ces zones (avec un clip), et on ne pousse que ces
+    rectangles à l'écran avec `pygame.display.update`.
+    """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.layers = []
+        self.full_redraw = True
+
+    def add_layer(self, name, draw, bounds, signature=None):
+        self.layers.append(Layer(name, draw, bounds, signature))  # Dans l'ordre de dessin
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def collect_dirty_rects(self):
+        dirty = []
+        for layer in self.layers:
+            bounds = layer.bounds()
+            signature = layer.signature() if layer.signature else None
+            if signature != layer.last_signature or bounds != layer.last_bounds:
+                dirty.extend(layer.last_bounds)
+                dirty.extend(bounds)
+            layer.last_bounds = bounds
+            layer.last_signature = signature
+        return merge_rects(dirty)
+
+    def render(self):
+        """Redessine les zones sales et renvoie les rectangles à envoyer à l'écran."""
+        dirty = self.collect_dirty_rects()
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.screen.blit(self.background, (0, 0))
+            for layer in self.layers:
+                if layer.last_bounds:
+                    layer.draw()
+            return [self.screen.get_rect()]
+
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self.screen.blit(self.background, rect, rect)
+            for layer in self.layers:
+                if rect.collidelist(layer.last_bounds) != -1:
+                    layer.draw()
+        self.screen.set_clip(None)
+        return dirty
+
+    def present(self, rects):
+        if rects:
+            pygame.display.update(rects)
+
+
+def merge_rects(rects):
+    # Fusionne les rectangles qui se chevauchent pour ne pas redessiner deux fois la même zone
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
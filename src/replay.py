@@ -0,0 +1,180 @@
+"""Enregistrement et rejeu des parties.
+
+Une partie enregistrée est un fichier JSON Lines, une entrée par ligne :
+
+    {"version": 2, "seed": ..., "content": ..., "start": {...}}   état de départ
+    ["u", t]              mise à jour de la simulation à l'instant t (ms)
+    ["c", [t1, t2, ...]]  clics sur le document (une frame)
+    ["b", nom, quantité]  achat d'amélioration
+    ["f", cible, mult, add, durée, nom, t]   buff temporaire (Simulation.add_buff)
+    {"end": {...}}        argent, stats, events et achievements en fin de partie
+
+    python src/replay.py partie.jsonl # rejoue sans affichage et compare le résultat
+
+Le rejeu ne dépend ni de pygame ni de l'horloge : chaque entrée porte son instant,
+la partie est donc rejouée aussi vite que possible, ce qui en fait un test de
+non-régression (et une mesure de la vitesse de la simulation).
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from content import load_content
+from constants import CONTENT_DIR
+from simulation import Simulation
+from effects import Modifier
+
+VERSION = 2
+READABLE_VERSIONS = (1, VERSION)  # La version 1 n'avait ni buffs ni entrées "f"
+
+
+def sim_state(sim):
+    """État complet de la simulation, y compris le combo et l'horloge du revenu passif."""
+    state = sim.to_save_data()
+    del state['saved_at']  # Pas de gains hors-ligne au rejeu
+    state.update({
+        'last_passive_update': sim.last_passive_update,
+        'combo_counter': sim.combo_counter,
+        'score_multiplier': sim.score_multiplier,
+        'last_click_time': sim.last_click_time,
+        'buffs': [
+            [modifier.target, modifier.add, modifier.mult, modifier.source, modifier.expires_at]
+            for modifier in sim.effects.modifiers.values() if modifier.expires_at is not None
+        ],
+    })
+    return state
+
+
+def restore_state(sim, state):
+    sim.load_save_data(state)
+    sim.stats = dict(state['stats'])
+    sim.last_passive_update = state['last_passive_update']
+    sim.combo_counter = state['combo_counter']
+    sim.score_multiplier = state['score_multiplier']
+    sim.last_click_time = state['last_click_time']
+    sim.schedule_combo_reset()
+    for buff in state.get('buffs', []):
+        sim.effects.add(Modifier(*buff))
+
+
+def outcome(sim):
+    return {
+        'money': sim.money,
+        'stats': dict(sim.stats),
+        'current_position': sim.current_position,
+        'upgrades': {upgrade.name: upgrade.count for upgrade in sim.upgrades},
+        'triggered_events': [event.title for event in sim.story_events if event.triggered],
+        'achievements': [achievement.title for achievement in sim.achievements if achievement.unlocked],
+    }
+
+
+class Recorder:
+    """Écrit les entrées de la simulation dans un fichier, au fil de la partie."""
+
+    def __init__(self, path, sim):
+        self.sim = sim
+        self.file = open(path, 'w', encoding='utf-8')
+        self.write({'version': VERSION, 'seed': sim.seed, 'content': sim.content.digest, 'start': sim_state(sim)})
+        sim.recorder = self
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def update(self, current_time):
+        self.write(['u', current_time])
+
+    def clicks(self, timestamps):
+        self.write(['c', timestamps])
+
+    def purchase(self, name, quantity):
+        self.write(['b', name, quantity])
+
+    def buff(self, target, mult, add, duration, name, now):
+        self.write(['f', target, mult, add, duration, name, now])
+
+    def close(self):
+        self.sim.recorder = None
+        self.write({'end': outcome(self.sim)})
+        self.file.close()
+
+
+def read_log(path):
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('version') not in READABLE_VERSIONS:
+            raise ValueError(f"Version d'enregistrement inconnue : {header.get('version')}")
+        entries = [json.loads(line) for line in f]
+    end = entries.pop()['end'] if entries and isinstance(entries[-1], dict) else None
+    return header, entries, end
+
+
+def replay(header, entries, content=None):
+    """Rejoue les entrées et renvoie la simulation dans son état final."""
+    sim = Simulation(clock=lambda: 0, on_message=lambda *args, **kwargs: None,
+                     content=content, seed=header['seed'])
+    restore_state(sim, header['start'])
+    upgrades = {upgrade.name: upgrade for upgrade in sim.upgrades}
+    for entry in entries:
+        kind = entry[0]
+        if kind == 'u':
+            sim.update(entry[1])
+        elif kind == 'c':
+            sim.click_batch(entry[1])
+        elif kind == 'b':
+            sim.try_purchase_upgrade(upgrades[entry[1]], entry[2])
+        elif kind == 'f':
+            sim.add_buff(*entry[1:])
+    return sim
+
+
+def same(expected, actual):
+    """Égalité exacte, sauf pour les montants : l'ordre des additions peut changer les derniers chiffres."""
+    if isinstance(expected, float) or isinstance(actual, float):
+        return (isinstance(actual, (int, float)) and isinstance(expected, (int, float))
+                and math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-6))
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(same(expected[key], actual[key]) for key in expected)
+    return expected == actual
+
+
+def differences(expected, actual):
+    return [
+        f"{key} : enregistré {expected[key]!r}, rejoué {actual.get(key)!r}"
+        for key in expected if not same(expected[key], actual.get(key))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue une partie enregistrée et vérifie son résultat")
+    parser.add_argument('log', help="fichier enregistré avec main.py --record")
+    parser.add_argument('--content', default=CONTENT_DIR, help="dossier du contenu (content/ par défaut)")
+    args = parser.parse_args()
+
+    header, entries, end = read_log(args.log)
+    content = load_content(args.content)
+    if content.digest != header['content']:
+        print("Attention : le contenu a changé depuis l'enregistrement")
+
+    start = time.perf_counter()
+    sim = replay(header, entries, content)
+    elapsed = time.perf_counter() - start
+
+    updates = [entry[1] for entry in entries if entry[0] == 'u']
+    played = (updates[-1] - updates[0]) / 1000 if len(updates) > 1 else 0.0
+    print(f"{len(entries)} entrées, {played:.1f} s de jeu rejouées en {elapsed:.3f} s"
+          + (f" (x{played / elapsed:.0f})" if elapsed > 0 and played else ""))
+
+    if end is None:
+        print("Enregistrement sans résultat final (partie interrompue) : rien à comparer")
+        return
+    mismatches = differences(end, outcome(sim))
+    for line in mismatches:
+        print(line)
+    if mismatches:
+        sys.exit(1)
+    print("Résultat identique à l'enregistrement")
+
+
+if __name__ == "__main__":
+    main()
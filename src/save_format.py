@@ -0,0 +1,204 @@
+"""Format de sauvegarde binaire compact et versionné.
+
+    en-tête   : magic b'BCSV', version (H), nombre d'events déclenchés (H),
+                d'achievements débloqués (H), d'améliorations (H)
+    état      : horodatage, argent, stats, préférences audio (struct de taille fixe)
+    poste     : chaîne UTF-8 préfixée par sa longueur (H)
+    events    : titres des events déclenchés
+    achievs   : titres des achievements débloqués
+    upgrades  : pour chaque amélioration, nom UTF-8, niveau et coût (entier de taille variable)
+
+Events et achievements sont désignés par leur titre : la sauvegarde reste juste quand
+le contenu change (ajout, réordonnancement). La version 1 les stockait en bitsets,
+dans l'ordre du jeu ; `decode` la lit encore, sans titres (titre None, position seule).
+
+`encode` et `decode` travaillent sur le même dict que la sauvegarde JSON, ce qui
+permet de migrer une ancienne sauvegarde simplement en la relisant puis en la réécrivant.
+"""
+import json
+import struct
+import sys
+from content import load_content
+from constants import CONTENT_DIR
+
+MAGIC = b'BCSV'
+VERSION = 2
+
+
+class UnknownVersionError(ValueError):
+    """Sauvegarde d'une version plus récente du jeu : à ne pas écraser."""
+
+HEADER = struct.Struct('<4sHHHH')
+STATE = struct.Struct('<ddddQdQ??ff')
+
+
+def unpack_bits(data, count):
+    value = int.from_bytes(data, 'little')
+    return [bool(value >> i & 1) for i in range(count)]
+
+
+def take(view, offset, size):
+    """(octets de `offset` à `offset + size`, offset suivant), ou ValueError si le fichier est trop court."""
+    end = offset + size
+    if end > len(view):
+        raise ValueError("Sauvegarde tronquée")
+    return view[offset:end], end
+
+
+def take_string(view, offset, length_size=2):
+    length, offset = take(view, offset, length_size)
+    raw, offset = take(view, offset, int.from_bytes(length, 'little'))
+    return bytes(raw).decode('utf-8'), offset
+
+
+def pack_string(text):
+    raw = text.encode('utf-8')
+    if len(raw) > 0xFFFF:
+        raise ValueError(f"Texte trop long pour la sauvegarde ({len(raw)} octets) : {text[:40]!r}...")
+    return struct.pack('<H', len(raw)) + raw
+
+
+def with_titles(save_data, content):
+    """Copie d'une ancienne sauvegarde où events et achievements, repérés par leur
+    position dans `content`, sont désignés par leur titre."""
+    events = save_data.get('triggered_events', [])
+    if any(isinstance(flag, bool) for flag in events):
+        events = [event.title for event, flag in zip(content.story_events, events) if flag]
+    achievements = [
+        (content.achievements[i].title if title is None else title, unlocked)
+        for i, (title, unlocked) in enumerate(save_data.get('achievements', []))
+        if title is not None or i < len(content.achievements)
+    ]
+    return dict(save_data, triggered_events=events, achievements=achievements)
+
+
+def encode(save_data):
+    stats = save_data['stats']
+    events = save_data.get('triggered_events', [])
+    achievements = save_data.get('achievements', [])
+    if any(not isinstance(title, str) for title in events) or any(title is None for title, _ in achievements):
+        raise ValueError("Events ou achievements sans titre : passer d'abord la sauvegarde par with_titles")
+    achievements = [title for title, unlocked in achievements if unlocked]
+    upgrades = save_data['upgrades']
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, len(events), len(achievements), len(upgrades)),
+        STATE.pack(
+            save_data.get('saved_at', 0.0),
+            save_data['money'],
+            save_data['click_value'],
+            save_data['passive_income'],
+            stats['total_clicks'],
+            stats['total_money_earned'],
+            stats['total_upgrades_bought'],
+            save_data.get('music_enabled', True),
+            save_data.get('sound_enabled', True),
+            save_data.get('music_volume', 0.5),
+            save_data.get('sound_volume', 0.2)
+        ),
+        pack_string(save_data.get('current_position', "Stagiaire")),
+    ]
+    parts.extend(pack_string(title) for title in events)
+    parts.extend(pack_string(title) for title in achievements)
+    for name, count, cost in upgrades:
+        cost = int(cost)
+        raw_cost = cost.to_bytes((cost.bit_length() + 7) // 8, 'little')
+        parts.append(pack_string(name) + struct.pack('<IB', count, len(raw_cost)) + raw_cost)
+    return b''.join(parts)
+
+
+def decode_v1(view, offset, event_count, achievement_count, upgrade_count):
+    return decode_body(view, offset, event_count, achievement_count, upgrade_count, version=1)
+
+
+def decode_v2(view, offset, event_count, achievement_count, upgrade_count):
+    return decode_body(view, offset, event_count, achievement_count, upgrade_count, version=2)
+
+
+def decode_body(view, offset, event_count, achievement_count, upgrade_count, version):
+    # Chaque lecture vérifie la longueur restante : un fichier coupé donne une ValueError
+    length_size = 1 if version == 1 else 2
+    state, offset = take(view, offset, STATE.size)
+    (saved_at, money, click_value, passive_income, total_clicks, total_money_earned,
+     total_upgrades_bought, music_enabled, sound_enabled, music_volume, sound_volume) = STATE.unpack(state)
+
+    current_position, offset = take_string(view, offset, length_size)
+
+    if version == 1:
+        # Bitsets dans l'ordre du contenu de l'époque : positions seulement
+        bits, offset = take(view, offset, (event_count + 7) // 8)
+        triggered_events = unpack_bits(bits, event_count)
+        bits, offset = take(view, offset, (achievement_count + 7) // 8)
+        achievements = [(None, flag) for flag in unpack_bits(bits, achievement_count)]
+    else:
+        triggered_events = []
+        for _ in range(event_count):
+            title, offset = take_string(view, offset)
+            triggered_events.append(title)
+        achievements = []
+        for _ in range(achievement_count):
+            title, offset = take_string(view, offset)
+            achievements.append((title, True))
+
+    upgrades = []
+    for _ in range(upgrade_count):
+        name, offset = take_string(view, offset, length_size)
+        fields, offset = take(view, offset, 5)
+        count, cost_size = struct.unpack('<IB', fields)
+        raw_cost, offset = take(view, offset, cost_size)
+        upgrades.append((name, count, int.from_bytes(raw_cost, 'little')))
+    if offset != len(view):
+        raise ValueError("Sauvegarde invalide : octets en trop après la dernière amélioration")
+
+    save_data = {
+        'money': money,
+        'click_value': click_value,
+        'passive_income': passive_income,
+        'stats': {
+            'total_clicks': total_clicks,
+            'total_money_earned': total_money_earned,
+            'total_upgrades_bought': total_upgrades_bought
+        },
+        'upgrades': upgrades,
+        'current_position': current_position,
+        'triggered_events': triggered_events,
+        'achievements': achievements,
+        'music_enabled': music_enabled,
+        'sound_enabled': sound_enabled,
+        'music_volume': music_volume,
+        'sound_volume': sound_volume
+    }
+    if saved_at:
+        save_data['saved_at'] = saved_at  # 0 : ancienne sauvegarde sans horodatage
+    return save_data
+
+
+DECODERS = {1: decode_v1, 2: decode_v2}
+
+
+def decode(data):
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise ValueError("Sauvegarde tronquée")
+    magic, version, event_count, achievement_count, upgrade_count = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Ce n'est pas une sauvegarde Business Clicker")
+    if version not in DECODERS:
+        raise UnknownVersionError(f"Version de sauvegarde inconnue : {version}")
+    return DECODERS[version](view, HEADER.size, event_count, achievement_count, upgrade_count)
+
+
+def migrate(json_path, binary_path, content_dir=CONTENT_DIR):
+    with open(json_path, 'r') as f:
+        save_data = json.load(f)
+    # Les anciennes sauvegardes JSON repèrent les events par position : on les nomme
+    # d'après le contenu actuel, une fois pour toutes
+    save_data = with_titles(save_data, load_content(content_dir))
+    with open(binary_path, 'wb') as f:
+        f.write(encode(save_data))
+
+
+if __name__ == "__main__":
+    # python save_format.py sauvegarde.json [autres.json...] : écrit un .bin à côté de chaque fichier
+    for path in sys.argv[1:]:
+        migrate(path, path.rsplit('.', 1)[0] + '.bin')
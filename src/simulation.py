@@ -0,0 +1,456 @@
+import time
+import math
+import random
+from typing import Callable, List, Optional
+from models import Upgrade
+from story_events import StoryEvent
+from achievements import Achievement
+from content import ContentPack, load_content
+from effects import EffectEngine, Modifier
+from timers import TimerScheduler
+from constants import OFFLINE_EARNINGS, UPGRADE_COST_GROWTH
+from pricing import BUY_MAX, locate, get_cost_table
+from triggers import TriggerIndex
+
+# Ordre de déclenchement quand plusieurs seuils tombent dans la même frame
+STORY, PROMOTION, ACHIEVEMENT = 0, 1, 2
+
+
+def monotonic_ms():
+    return int(time.perf_counter() * 1000)
+
+
+class Simulation:
+    """Règles du jeu, sans aucune dépendance à pygame.
+
+    L'horloge est injectable (une fonction qui renvoie des millisecondes) :
+    le front-end pygame passe `pygame.time.get_ticks`, les tests et outils
+    peuvent passer une horloge simulée et avancer le temps aussi vite qu'ils veulent.
+    Le contenu (améliorations, events, achievements, postes) vient d'un `ContentPack`,
+    celui du dossier content/ par défaut. Tout l'aléatoire de l'état de la partie
+    passe par `rng`, initialisé avec `seed` : une partie enregistrée (voir replay.py)
+    se rejoue à l'identique. Sons et particules ont leurs propres générateurs (même
+    graine) : ils ne touchent pas à `rng` et n'influencent pas la partie. Gain par clic et revenu passif passent par `effects` (bonus des
+    postes, des achievements et buffs temporaires) et sont gardés en cache.
+    Ce qui doit arriver à un instant donné (fin du combo) passe par `timers`, que
+    `update` fait avancer ; les buffs expirent via `effects`.
+    """
+
+    def __init__(self, clock: Optional[Callable[[], int]] = None, on_message=None,
+                 content: Optional[ContentPack] = None, seed: Optional[int] = None,
+                 cost_growth: float = UPGRADE_COST_GROWTH):
+        self.clock = clock or monotonic_ms
+        self.content = content or load_content()
+        self.on_message = on_message
+        self.pending_messages = []  # Messages émis quand aucun callback n'est branché
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recorder = None  # Recorder de replay.py pendant un enregistrement
+        self.cost_growth = cost_growth  # Multiplicateur du coût à chaque niveau (balance.py le fait varier)
+
+        # État du jeu
+        self.money = 0
+        self.click_value = 1  # Gain par clic de base, avant les effets
+        self.effects = EffectEngine()
+        self.last_passive_update = self.clock()
+        self.score_multiplier = 1.0
+        self.combo_counter = 0
+        self.last_click_time = 0
+        self.combo_timeout = 1000  # En millisecondes
+        self.combo_timer = None
+        self.timers = TimerScheduler()
+
+        # Systèmes de jeu
+        self.upgrades: List[Upgrade] = self.content.new_upgrades()
+        self.story_events: List[StoryEvent] = self.content.new_story_events()
+        self.achievements: List[Achievement] = self.content.new_achievements()
+        self.promotion_levels = self.content.promotions
+        self.current_position = "Stagiaire"
+        self.refresh_permanent_effects()
+
+        # Statistiques
+        self.stats = {
+            'total_clicks': 0,
+            'total_money_earned': 0,
+            'total_upgrades_bought': 0
+        }
+
+        self.rebuild_triggers()
+
+    @property
+    def click_income(self):
+        """Gain par clic avec les effets, hors combo."""
+        return self.effects.get_rates(self.click_value, self.upgrades)[0]
+
+    @property
+    def passive_income(self):
+        return self.effects.get_rates(self.click_value, self.upgrades)[1]
+
+    def refresh_permanent_effects(self):
+        """Effets du poste actuel (et des postes d'avant) et des achievements débloqués."""
+        self.effects.remove_source('promotion:')
+        self.effects.remove_source('achievement:')
+        current_threshold = self.promotion_levels.get(self.current_position, 0)
+        for position, threshold in self.promotion_levels.items():
+            if threshold <= current_threshold:
+                for modifier in self.content.new_effects(f"promotion:{position}"):
+                    self.effects.add(modifier)
+        for achievement in self.achievements:
+            if achievement.unlocked:
+                for modifier in self.content.new_effects(f"achievement:{achievement.title}"):
+                    self.effects.add(modifier)
+        self.effects.invalidate()
+
+    def add_buff(self, target, mult=1.0, add=0.0, duration=10000, name='buff', now=None):
+        """Modificateur temporaire sur `target` pendant `duration` ms ; renvoie son handle dans `effects`."""
+        if now is None:
+            now = self.clock()
+        if self.recorder:
+            self.recorder.buff(target, mult, add, duration, name, now)
+        return self.effects.add(Modifier(target, add, mult, f"buff:{name}", now + duration))
+
+    def schedule_combo_reset(self):
+        """Le combo retombe à x1 quand aucun clic n'arrive pendant `combo_timeout`."""
+        if self.combo_timer:
+            self.combo_timer.cancel()
+        self.combo_timer = self.timers.schedule(self.last_click_time + self.combo_timeout, self.reset_combo)
+
+    def reset_combo(self):
+        self.combo_counter = 0
+        self.score_multiplier = 1.0
+
+    def notify(self, title, description, priority='normal'):
+        if self.on_message:
+            self.on_message(title, description, priority=priority)
+        else:
+            self.pending_messages.append((title, description, priority))
+
+    def click(self, current_time=None):
+        if current_time is None:
+            current_time = self.clock()
+        if self.recorder:
+            self.recorder.clicks([current_time])
+        if current_time - self.last_click_time < self.combo_timeout:
+            self.combo_counter += 1
+            self.score_multiplier = min(2.0, 1 + (self.combo_counter * 0.1))
+        else:
+            self.combo_counter = 0
+            self.score_multiplier = 1.0
+
+        self.last_click_time = current_time
+        self.schedule_combo_reset()
+
+        gain = self.click_income * self.score_multiplier
+        self.money += gain
+        self.stats['total_clicks'] += 1
+        self.stats['total_money_earned'] += gain
+        return gain
+
+    def click_batch(self, timestamps):
+        """Applique d'un coup les clics d'une frame (horodatages croissants, en ms).
+
+        Même calcul, dans le même ordre, qu'un appel à `click` par horodatage :
+        combo, argent et stats sont identiques au centime près, sans repasser par
+        les attributs à chaque clic.
+        """
+        if self.recorder:
+            self.recorder.clicks(list(timestamps))
+        click_income = self.click_income
+        money = self.money
+        earned = self.stats['total_money_earned']
+        counter, multiplier, last_time = self.combo_counter, self.score_multiplier, self.last_click_time
+        total = 0.0
+        for current_time in timestamps:
+            if current_time - last_time < self.combo_timeout:
+                counter += 1
+                multiplier = min(2.0, 1 + (counter * 0.1))
+            else:
+                counter = 0
+                multiplier = 1.0
+            last_time = current_time
+
+            gain = click_income * multiplier
+            money += gain
+            earned += gain
+            total += gain
+
+        self.money = money
+        self.stats['total_money_earned'] = earned
+        self.stats['total_clicks'] += len(timestamps)
+        self.combo_counter, self.score_multiplier, self.last_click_time = counter, multiplier, last_time
+        if timestamps:
+            self.schedule_combo_reset()
+        return total
+
+    def purchase_quote(self, upgrade, quantity=1):
+        """(nombre de niveaux, prix total) pour `quantity` niveaux, ou BUY_MAX."""
+        table, start = locate(upgrade, self.cost_growth)
+        if quantity == BUY_MAX:
+            quantity = table.max_affordable(start, self.money)
+            if quantity == 0:
+                return 1, table.cost_at(start)
+        return quantity, table.total(start, quantity)
+
+    def try_purchase_upgrade(self, upgrade, quantity=1):
+        if self.recorder:
+            self.recorder.purchase(upgrade.name, quantity)
+        # Prix exact de N niveaux (troncature à chaque niveau comprise) sans boucler N fois
+        table, start = locate(upgrade, self.cost_growth)
+        if quantity == BUY_MAX:
+            quantity = table.max_affordable(start, self.money)
+        if quantity <= 0:
+            return 0
+        total = table.total(start, quantity)
+
+        # Vérifier si l'utilisateur a assez d'argent
+        if self.money >= total:
+            self.money -= total
+            upgrade.count += quantity
+            self.effects.invalidate()
+            self.stats['total_upgrades_bought'] += quantity
+
+            upgrade.cost = table.cost_at(start + quantity)
+            return quantity
+        return 0
+
+    def update(self, current_time=None):
+        if current_time is None:
+            current_time = self.clock()
+        if self.recorder:
+            self.recorder.update(current_time)
+        # La fin d'un buff change le revenu : on crédite jusqu'à chacune, et seulement
+        # là (découper le revenu ailleurs changerait les arrondis, et donc le rejeu)
+        expiry = self.effects.next_expiry()
+        while expiry is not None and expiry <= current_time:
+            self.earn_passive(expiry)
+            self.effects.expire(expiry)
+            expiry = self.effects.next_expiry()
+        self.earn_passive(current_time)
+        self.timers.run(current_time)
+
+        self.check_triggers()
+
+    def earn_passive(self, current_time):
+        time_diff = (current_time - self.last_passive_update) / 1000.0
+
+        if time_diff > 0:  # Éviter les calculs inutiles
+            earned = self.passive_income * time_diff
+            self.money += earned
+            self.stats['total_money_earned'] += earned
+            self.last_passive_update = current_time
+
+    def apply_content(self, content):
+        """Remplace le contenu en cours de partie en gardant la progression.
+
+        Niveaux d'améliorations, events vus et achievements débloqués sont retrouvés
+        par nom ; le prix et le revenu passif suivent les nouvelles valeurs.
+        """
+        counts = {upgrade.name: upgrade.count for upgrade in self.upgrades}
+        triggered = {event.title for event in self.story_events if event.triggered}
+        unlocked = {achievement.title for achievement in self.achievements if achievement.unlocked}
+
+        self.content = content
+        self.upgrades = content.new_upgrades()
+        for upgrade in self.upgrades:
+            upgrade.count = counts.get(upgrade.name, 0)
+            upgrade.cost = get_cost_table(upgrade.base_cost, self.cost_growth).cost_at(upgrade.count)
+
+        self.story_events = content.new_story_events()
+        for event in self.story_events:
+            event.triggered = event.title in triggered
+        self.achievements = content.new_achievements()
+        for achievement in self.achievements:
+            achievement.unlocked = achievement.title in unlocked
+        self.promotion_levels = content.promotions
+        self.refresh_permanent_effects()
+
+        # Les nouveaux seuils déjà dépassés se déclencheront à la prochaine mise à jour
+        self.rebuild_triggers()
+
+    def rebuild_triggers(self):
+        """Indexe les seuils pas encore franchis (à refaire quand les flags changent)."""
+        self.triggers = TriggerIndex()
+        for i, event in enumerate(self.story_events):
+            if not event.triggered:
+                self.triggers.add(event.event_type, event.trigger_value, (STORY, i), event)
+
+        current_threshold = self.promotion_levels.get(self.current_position, 0)
+        for i, (position, threshold) in enumerate(self.promotion_levels.items()):
+            if threshold > current_threshold:
+                self.triggers.add('money', threshold, (PROMOTION, i), position)
+
+        for i, achievement in enumerate(self.achievements):
+            if not achievement.unlocked:
+                self.triggers.add(achievement.condition_type, achievement.condition_value, (ACHIEVEMENT, i), achievement)
+
+    def check_triggers(self):
+        crossed = (
+            self.triggers.advance('money', self.money) +
+            self.triggers.advance('clicks', self.stats['total_clicks']) +
+            self.triggers.advance('upgrades', self.stats['total_upgrades_bought']) +
+            self.triggers.advance('money_earned', self.stats['total_money_earned'])
+        )
+        if not crossed:
+            return
+
+        # Même ordre qu'avant : events, puis promotion (la plus haute atteinte), puis achievements
+        crossed.sort(key=lambda x: x[0])
+        promotions = [target for (kind, _), target in crossed if kind == PROMOTION]
+        for (kind, _), target in crossed:
+            if kind == STORY:
+                self.trigger_story_event(target)
+        if promotions:
+            self.promote(promotions[-1])
+        for (kind, _), target in crossed:
+            if kind == ACHIEVEMENT:
+                self.unlock_achievement(target)
+
+    def trigger_story_event(self, event):
+        event.triggered = True
+        self.notify(event.title, event.description, priority='story')
+
+    def promote(self, position):
+        self.current_position = position
+        self.refresh_permanent_effects()
+        self.notify(
+            f"Promotion !",
+            f"Félicitations ! Vous êtes promu {position}. Nouveaux avantages débloqués !"
+        )
+
+    def apply_offline_progress(self, elapsed):
+        """Crédite `elapsed` secondes de revenu passif d'un coup.
+
+        Les buffs en cours expirent pendant l'absence : le temps est découpé à chaque
+        expiration, et sur chaque morceau le revenu est constant.
+        """
+        if elapsed <= 0:
+            return 0
+        money_start = self.money
+        start = self.last_passive_update
+        expiry = self.effects.next_expiry()
+        while expiry is not None and (expiry - start) / 1000 < elapsed:
+            segment = max(0.0, (expiry - start) / 1000)
+            self.advance_offline(segment)
+            elapsed -= segment
+            start = max(start, expiry)
+            self.effects.expire(expiry)
+            expiry = self.effects.next_expiry()
+        self.advance_offline(elapsed)
+        return self.money - money_start
+
+    def advance_offline(self, elapsed):
+        """`elapsed` secondes sans expiration de buff.
+
+        L'instant où chaque seuil est franchi se calcule directement : on saute de
+        seuil en seuil (O(nombre de seuils)) et on déclenche events, promotions et
+        achievements dans l'ordre où ils arrivent.
+        """
+        rate = self.passive_income
+
+        def time_to(threshold, value):
+            if threshold is None:
+                return math.inf
+            if value >= threshold:
+                return 0.0
+            return (threshold - value) / rate if rate > 0 else math.inf
+
+        # Seuils sur l'argent possédé (events, promotions) et sur l'argent total gagné (achievements)
+        t = 0.0
+        while True:
+            dt_money = time_to(self.triggers.peek('money'), self.money)
+            dt_earned = time_to(self.triggers.peek('money_earned'), self.stats['total_money_earned'])
+            dt = min(dt_money, dt_earned)
+            if t + dt > elapsed:
+                break
+
+            earned = rate * dt
+            self.money += earned
+            self.stats['total_money_earned'] += earned
+            t += dt
+
+            metric = 'money' if dt_money <= dt_earned else 'money_earned'
+            for (kind, _), target in self.triggers.take(metric):
+                if kind == STORY:
+                    self.trigger_story_event(target)
+                elif kind == PROMOTION:
+                    self.promote(target)
+                else:
+                    self.unlock_achievement(target)
+            rate = self.passive_income  # Une promotion ou un achievement peut apporter un bonus
+
+        earned = rate * (elapsed - t)
+        self.money += earned
+        self.stats['total_money_earned'] += earned
+
+    def unlock_achievement(self, achievement):
+        achievement.unlocked = True
+        self.money += achievement.reward
+        for modifier in self.content.new_effects(f"achievement:{achievement.title}"):
+            self.effects.add(modifier)
+        self.notify(
+            f"Achievement débloqué : {achievement.title}",
+            f"{achievement.description}\nRécompense : {achievement.reward}€",
+            priority='achievement'
+        )
+
+    def to_save_data(self, saved_at=None):
+        return {
+            'saved_at': time.time() if saved_at is None else saved_at,
+            'money': self.money,
+            'click_value': self.click_value,
+            'passive_income': self.passive_income,
+            'stats': dict(self.stats),
+            'upgrades': [(u.name, u.count, u.cost) for u in self.upgrades],
+            'current_position': self.current_position,
+            'triggered_events': [event.title for event in self.story_events if event.triggered],
+            'achievements': [(a.title, a.unlocked) for a in self.achievements],
+        }
+
+    def load_save_data(self, data, now=None):
+        self.money = data['money']
+        self.click_value = data['click_value']  # Le revenu passif enregistré se recalcule
+        self.stats = data['stats']
+        self.current_position = data.get('current_position', "Stagiaire")
+
+        # Events et achievements sont retrouvés par leur titre, comme dans apply_content :
+        # ajouter ou réordonner du contenu ne décale pas la progression. Les anciennes
+        # sauvegardes sans titres (liste de booléens, titre None) sont lues dans l'ordre du jeu.
+        for event in self.story_events:
+            event.triggered = False
+        for i, saved in enumerate(data.get('triggered_events', [])):
+            if isinstance(saved, bool):
+                index = i if saved else None
+            else:
+                index = self.content.story_index.get(saved)
+            if index is not None and index < len(self.story_events):
+                self.story_events[index].triggered = True
+
+        # Charger les améliorations, retrouvées par leur nom
+        upgrades_by_name = {upgrade.name: upgrade for upgrade in self.upgrades}
+        # Le prix se recalcule avec le contenu actuel (comme apply_content) : le coût
+        # enregistré ne sert pas, une mise à jour des prix atteint aussi les anciennes parties
+        for name, count, _ in data['upgrades']:
+            upgrade = upgrades_by_name.get(name)
+            if upgrade:
+                upgrade.count = count
+                upgrade.cost = get_cost_table(upgrade.base_cost, self.cost_growth).cost_at(count)
+
+        for achievement in self.achievements:
+            achievement.unlocked = False
+        for i, (title, unlocked) in enumerate(data.get('achievements', [])):
+            index = i if title is None else self.content.achievement_index.get(title)
+            if index is not None and index < len(self.achievements):
+                self.achievements[index].unlocked = unlocked
+
+        self.refresh_permanent_effects()
+        self.rebuild_triggers()
+
+        # Gains accumulés pendant l'absence du joueur
+        if OFFLINE_EARNINGS and 'saved_at' in data:
+            now = time.time() if now is None else now
+            earned = self.apply_offline_progress(now - data['saved_at'])
+            if earned > 0:
+                self.notify(
+                    "Pendant votre absence",
+                    f"Vos employés ont gagné {int(earned)}€ pendant que vous n'étiez pas là."
+                )
@@ -0,0 +1,54 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """Rappel programmé ; `cancel()` l'annule tant qu'il n'a pas sonné."""
+    __slots__ = ('when', 'callback', 'args', 'cancelled')
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerScheduler:
+    """Rappels à déclencher à un instant donné (ms, horloge de la simulation).
+
+    Les timers sont dans un tas : `run(now)` ne touche que ceux qui sonnent, le
+    travail par frame ne dépend donc pas du nombre de timers en attente. Un timer
+    annulé reste dans le tas et est simplement ignoré quand il en sort. Deux timers
+    du même instant sonnent dans l'ordre où ils ont été programmés.
+    """
+
+    def __init__(self):
+        self.heap = []  # (instant, ordre, timer)
+        self.order = itertools.count()
+
+    def schedule(self, when, callback, *args):
+        timer = Timer(when, callback, args)
+        heapq.heappush(self.heap, (when, next(self.order), timer))
+        return timer
+
+    def next_time(self):
+        """Instant du prochain timer actif, ou None."""
+        heap = self.heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run(self, now):
+        """Déclenche, dans l'ordre, les timers dus à `now` (y compris ceux programmés en chemin)."""
+        heap = self.heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            _, _, timer = heapq.heappop(heap)
+            if not timer.cancelled:
+                timer.cancelled = True  # Un `cancel()` tardif ne fait plus rien
+                timer.callback(*timer.args)
+                fired += 1
+        return fired
@@ -0,0 +1,48 @@
+from bisect import insort
+
+
+class TriggerIndex:
+    """Seuils triés par métrique, avec un curseur sur le prochain seuil non franchi.
+
+    Une métrique (money, clicks, upgrades, money_earned) ne fait que comparer sa
+    valeur au prochain seuil : O(1) par frame tant que rien n'est franchi, quel que
+    soit le nombre d'events ou d'achievements. Franchir plusieurs seuils d'un coup
+    avance simplement le curseur.
+    """
+
+    def __init__(self):
+        self.entries = {}  # métrique -> liste triée de (seuil, clé d'ordre, cible)
+        self.cursors = {}  # métrique -> index du prochain seuil non franchi
+
+    def add(self, metric, threshold, order, target):
+        entries = self.entries.setdefault(metric, [])
+        self.cursors.setdefault(metric, 0)
+        insort(entries, (threshold, order, target), lo=self.cursors[metric])  # (seuil, ordre) est unique
+
+    def peek(self, metric):
+        """Prochain seuil non franchi de la métrique, ou None."""
+        entries = self.entries.get(metric)
+        if not entries:
+            return None
+        cursor = self.cursors[metric]
+        return entries[cursor][0] if cursor < len(entries) else None
+
+    def advance(self, metric, value):
+        """Renvoie les (ordre, cible) dont le seuil est atteint par `value`."""
+        entries = self.entries.get(metric)
+        if not entries:
+            return []
+        start = cursor = self.cursors[metric]
+        while cursor < len(entries) and value >= entries[cursor][0]:
+            cursor += 1
+        if cursor == start:
+            return []
+        self.cursors[metric] = cursor
+        return [(order, target) for _, order, target in entries[start:cursor]]
+
+    def take(self, metric):
+        """Franchit le prochain seuil quelle que soit la valeur (rattrapage hors-ligne)."""
+        threshold = self.peek(metric)
+        if threshold is None:
+            return []
+        return self.advance(metric, threshold)
@@ -0,0 +1,82 @@
+import pygame
+from constants import UPGRADE_ROW_HEIGHT, UPGRADE_SCROLL_STEP
+
+ROW_GAP = 10  # Espace entre deux boutons, hors zone cliquable
+
+
+class UpgradeList:
+    """Liste d'améliorations défilante et virtualisée.
+
+    Seules les lignes visibles dans `viewport` sont dessinées, chacune depuis une
+    surface en cache qui n'est refaite que quand son état (prix affiché, niveau,
+    achetable ou non) change. La ligne sous la souris se trouve par simple calcul
+    sur la position, sans parcourir les boutons.
+    """
+
+    def __init__(self, viewport, upgrades, row_height=UPGRADE_ROW_HEIGHT):
+        self.viewport = viewport
+        self.upgrades = upgrades
+        self.row_height = row_height
+        self.row_size = (viewport.width, row_height - ROW_GAP)
+        self.scroll = 0
+        self.rows = {}  # Index -> (upgrade, état, surface)
+
+    def max_scroll(self):
+        return max(0, len(self.upgrades) * self.row_height - ROW_GAP - self.viewport.height)
+
+    def scroll_by(self, dy):
+        self.scroll = min(self.max_scroll(), max(0, self.scroll + dy))
+
+    def on_wheel(self, wheel_y):
+        self.scroll_by(-wheel_y * UPGRADE_SCROLL_STEP)
+
+    def visible_range(self):
+        first = self.scroll // self.row_height
+        last = (self.scroll + self.viewport.height - 1) // self.row_height + 1
+        return range(first, min(last, len(self.upgrades)))
+
+    def visible(self):
+        return [self.upgrades[i] for i in self.visible_range()]
+
+    def row_rect(self, index):
+        return pygame.Rect(
+            self.viewport.x, self.viewport.y + index * self.row_height - self.scroll, *self.row_size
+        )
+
+    def index_at(self, pos):
+        if not self.viewport.collidepoint(pos):
+            return None
+        index, offset = divmod(pos[1] - self.viewport.y + self.scroll, self.row_height)
+        if offset >= self.row_size[1] or index >= len(self.upgrades):
+            return None  # Dans l'espace entre deux boutons, ou sous le dernier
+        return index
+
+    def upgrade_at(self, pos):
+        index = self.index_at(pos)
+        return self.upgrades[index] if index is not None else None
+
+    def draw(self, screen, row_state, render_row):
+        """`row_state(upgrade)` résume ce qu'affiche la ligne ; `render_row(upgrade, état)` la dessine."""
+        visible = self.visible_range()
+        rows = {}
+        clip = screen.get_clip()  # Celle du renderer (zone sale en cours)
+        screen.set_clip(self.viewport.clip(clip))
+        for index in visible:
+            upgrade = self.upgrades[index]
+            state = row_state(upgrade)
+            cached = self.rows.get(index)
+            if cached and cached[0] is upgrade and cached[1] == state:
+                surface = cached[2]
+            else:
+                surface = render_row(upgrade, state)
+            rows[index] = (upgrade, state, surface)
+            screen.blit(surface, self.row_rect(index))
+        screen.set_clip(clip)
+        self.rows = rows  # Les lignes sorties de l'écran quittent le cache
+
+        if self.max_scroll():
+            # Barre de défilement le long du bord droit
+            content = len(self.upgrades) * self.row_height
+            height = max(20, self.viewport.height * self.viewport.height // content)
+            y = self.viewport.y + (self.viewport.height - height) * self.scroll // self.max_scroll()
+            pygame.draw.rect(screen, (120, 120, 120), (self.viewport.right + 2, y, 4, height), border_radius=2)